@@ -3,10 +3,12 @@ Data Manager - 处理数据导入、解析和保存
 """
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from PySide6.QtCore import Property, QObject, QThread, Signal, Slot
+from PySide6.QtCore import Property, QCoreApplication, QObject, QThread, Signal, Slot
 
 from utils.chart_processor import ChartProcessor
 from utils.eaip_handler import EaipHandler
@@ -448,6 +450,7 @@ class DataManager(QObject):
     dataImportCompleted = Signal(bool, str)  # 成功/失败, 消息
     airportsLoaded = Signal(list)  # 机场数据加载完成
     periodUpdated = Signal(dict)  # AIRAC 周期更新完成
+    chartReady = Signal(str, str, str)  # 机场代码, 航图代码, 航图文件路径或错误信息
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -458,6 +461,9 @@ class DataManager(QObject):
         self._airac_period = "2505"  # 默认周期
         self._dir_name = "EAIP"  # 默认目录名
         self._import_worker: Optional[ImportWorker] = None  # 导入工作线程
+        self._chart_executor: Optional[ThreadPoolExecutor] = None  # 航图渲染线程（按需创建）
+        # PyMuPDF 不支持多线程并发访问，同步与异步获取航图时都要持有该锁
+        self._chart_lock = threading.Lock()
 
         # 导入配置
         from utils.config import Config
@@ -476,7 +482,12 @@ class DataManager(QObject):
         """初始化 EAIP 处理器"""
         try:
             logger.debug(f"初始化 EAIP 处理器: period={self._airac_period}, dir={self._dir_name}")
-            self._eaip_handler = EaipHandler(self._data_path, self._airac_period, self._dir_name)
+            self._eaip_handler = EaipHandler(
+                self._data_path,
+                self._airac_period,
+                self._dir_name,
+                max_workers=self._config.getImportWorkers(),
+            )
             logger.info("EAIP 处理器初始化成功")
         except Exception as e:
             logger.warning(f"EAIP 处理器初始化失败: {e}")
@@ -856,9 +867,74 @@ class DataManager(QObject):
         if not self._eaip_handler:
             return ""
 
+        # 同步调用直接在当前线程渲染，不排在渲染线程已有的异步任务之后
+        return self._fetch_chart(airport_code, chart_code)
+
+    @Slot(str, str)
+    def getChartByCodeAsync(self, airport_code: str, chart_code: str):
+        """
+        在后台线程获取航图，完成后通过 chartReady 信号返回结果（渲染期间不阻塞界面）
+
+        Args:
+            airport_code: 机场代码
+            chart_code: 航图代码
+        """
+        if not self._eaip_handler:
+            self.chartReady.emit(airport_code, chart_code, "")
+            return
+
+        try:
+            future = self._get_chart_executor().submit(self._fetch_chart, airport_code, chart_code)
+        except RuntimeError as e:
+            # 程序退出、渲染线程已关闭
+            self.chartReady.emit(airport_code, chart_code, f"获取航图失败: {e}")
+            return
+
+        def on_done(f):
+            # 退出时被取消的任务不再发出信号
+            if not f.cancelled():
+                self.chartReady.emit(airport_code, chart_code, f.result())
+
+        future.add_done_callback(on_done)
+
+    def _get_chart_executor(self) -> ThreadPoolExecutor:
+        """
+        获取航图渲染线程（首次调用时创建）
+
+        异步渲染任务都在这一个后台线程中依次执行
+
+        Returns:
+            单线程的线程池
+        """
+        if self._chart_executor is None:
+            self._chart_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ChartRender"
+            )
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self._shutdown_chart_executor)
+        return self._chart_executor
+
+    def _shutdown_chart_executor(self):
+        """程序退出时关闭渲染线程，丢弃尚未开始的渲染任务"""
+        if self._chart_executor is not None:
+            self._chart_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_chart(self, airport_code: str, chart_code: str) -> str:
+        """
+        获取航图并写入缓存文件（同步调用时在当前线程，异步调用时在渲染线程中执行）
+
+        Args:
+            airport_code: 机场代码
+            chart_code: 航图代码
+
+        Returns:
+            航图文件路径或错误信息
+        """
         try:
             # 获取航图数据
-            result = self._eaip_handler.get_chart_by_code(airport_code, chart_code)
+            with self._chart_lock:
+                result = self._eaip_handler.get_chart_by_code(airport_code, chart_code)
             if isinstance(result, bytes):
                 # 如果是图片数据，需要保存到缓存文件
                 temp_path = self._cache_path / f"{airport_code}_{chart_code}.png"
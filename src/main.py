@@ -6,17 +6,18 @@ EAIP Viewer - Electronic Aeronautical Information Publication Viewer
 
 import os
 import sys
-from pathlib import Path
 
-from PySide6.QtCore import QtMsgType, QUrl, qInstallMessageHandler
+from PySide6.QtCore import QTimer, QtMsgType, QUrl, qInstallMessageHandler
 from PySide6.QtGui import QGuiApplication, QIcon
 from PySide6.QtQml import QQmlApplicationEngine
 
+# src 目录（模块常量，避免启动时重复构造 Path）
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
 # 添加 src 目录到路径
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, _HERE)
 
-from controllers import AppController
-from utils import Logger
+from utils.logger import Logger
 
 
 def qt_message_handler(msg_type, context, message):
@@ -55,34 +56,37 @@ def main():
     app.setApplicationVersion("1.0.0")
 
     # 设置应用图标（如果存在）
-    icon_path = Path(__file__).parent / "resources" / "images" / "app_icon.png"
-    if icon_path.exists():
-        app.setWindowIcon(QIcon(str(icon_path)))
+    icon_path = os.path.join(_HERE, "resources", "images", "app_icon.png")
+    if os.path.isfile(icon_path):
+        app.setWindowIcon(QIcon(icon_path))
 
     # 创建 QML 引擎
     engine = QQmlApplicationEngine()
 
-    # 创建主控制器
+    # 创建主控制器（延迟导入：控制器会连带加载 PDF/航图处理模块，
+    # 放到 QGuiApplication 创建之后，避免拖慢应用启动）
+    from controllers import AppController
+
     app_controller = AppController()
 
     # 将控制器暴露给 QML
     engine.rootContext().setContextProperty("appController", app_controller)
 
     # 加载 QML 文件
-    qml_file = Path(__file__).parent / "qml" / "main.qml"
-    if not qml_file.exists():
+    qml_file = os.path.join(_HERE, "qml", "main.qml")
+    if not os.path.isfile(qml_file):
         print(f"错误: QML 文件不存在: {qml_file}")
         sys.exit(1)
 
-    engine.load(QUrl.fromLocalFile(str(qml_file)))
+    engine.load(QUrl.fromLocalFile(qml_file))
 
     # 检查是否成功加载
     if not engine.rootObjects():
         print("错误: 无法加载 QML 文件")
         sys.exit(1)
 
-    # 初始化应用
-    app_controller.initialize()
+    # 初始化应用（放到事件循环中执行，让主窗口先完成首帧绘制）
+    QTimer.singleShot(0, app_controller.initialize)
 
     # 运行应用
     exit_code = app.exec()
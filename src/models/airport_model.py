@@ -2,19 +2,21 @@
 Airport data model
 """
 
+import sys
 from typing import Any, Dict, List
 
-from PySide6.QtCore import Property, QAbstractListModel, QObject, Qt, Signal
+from PySide6.QtCore import Property, QAbstractListModel, QModelIndex, QObject, Qt, Signal
 
 
 class Airport:
     """单个机场数据类"""
 
     def __init__(self, code: str, name_zh: str, name_en: str, **kwargs):
-        self.code = code  # ICAO 代码，如 ZBAA
+        self.code = sys.intern(code) if code else ""  # ICAO 代码，如 ZBAA
         self.name_zh = name_zh  # 中文名称
         self.name_en = name_en  # 英文名称
         self.categories = kwargs.get("categories", [])  # 航图分类列表
+        self.chart_count = kwargs.get("chart_count", 0)  # 航图数量
         self.metadata = kwargs.get("metadata", {})  # 其他元数据
 
     def __repr__(self):
@@ -28,6 +30,7 @@ class AirportModel(QAbstractListModel):
     NameZhRole = Qt.UserRole + 2
     NameEnRole = Qt.UserRole + 3
     CategoriesRole = Qt.UserRole + 4
+    ChartCountRole = Qt.UserRole + 5
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -40,6 +43,10 @@ class AirportModel(QAbstractListModel):
         if not index.isValid() or index.row() >= len(self._airports):
             return None
 
+        # 只暴露自定义角色，DisplayRole 等内置角色直接返回
+        if role <= Qt.UserRole:
+            return None
+
         airport = self._airports[index.row()]
 
         if role == self.CodeRole:
@@ -50,6 +57,8 @@ class AirportModel(QAbstractListModel):
             return airport.name_en
         elif role == self.CategoriesRole:
             return airport.categories
+        elif role == self.ChartCountRole:
+            return airport.chart_count or 0
 
         return None
 
@@ -59,29 +68,30 @@ class AirportModel(QAbstractListModel):
             self.NameZhRole: b"nameZh",
             self.NameEnRole: b"nameEn",
             self.CategoriesRole: b"categories",
+            self.ChartCountRole: b"chartCount",
         }
 
     def addAirport(self, airport: Airport):
         """添加机场"""
-        self.beginInsertRows(
-            self.index(len(self._airports)), len(self._airports), len(self._airports)
-        )
+        row = len(self._airports)
+        self.beginInsertRows(QModelIndex(), row, row)
         self._airports.append(airport)
         self.endInsertRows()
 
     def loadAirports(self, airports_data: List[Dict[str, Any]]):
         """从数据字典列表加载机场"""
         self.beginResetModel()
-        self._airports.clear()
-        for data in airports_data:
-            airport = Airport(
+        self._airports = [
+            Airport(
                 code=data.get("code", ""),
                 name_zh=data.get("name_zh", ""),
                 name_en=data.get("name_en", ""),
                 categories=data.get("categories", []),
+                chart_count=data.get("chart_count", 0),
                 metadata=data.get("metadata", {}),
             )
-            self._airports.append(airport)
+            for data in airports_data
+        ]
         self.endResetModel()
 
     def clear(self):
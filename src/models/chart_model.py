@@ -2,9 +2,11 @@
 Chart data model
 """
 
+import os
+import sys
 from typing import Any, Dict, List
 
-from PySide6.QtCore import Property, QAbstractListModel, QObject, Qt, Signal
+from PySide6.QtCore import Property, QAbstractListModel, QModelIndex, QObject, Qt, QUrl, Signal
 
 
 class Chart:
@@ -13,9 +15,15 @@ class Chart:
     def __init__(self, chart_id: str, name: str, category: str, file_path: str, **kwargs):
         self.chart_id = chart_id  # 航图ID
         self.name = name  # 航图名称，如 "AD 1.1"
-        self.category = category  # 分类，如 "AD", "SID", "STAR"
+        # 分类和机场代码在大量航图间重复出现，驻留后共享同一字符串对象
+        self.category = sys.intern(category) if category else ""  # 分类，如 "AD", "SID", "STAR"
         self.file_path = file_path  # PDF 文件路径
-        self.airport_code = kwargs.get("airport_code", "")  # 所属机场代码
+        # 文件路径不可变，加载时一次性生成 file:// URL，QML 可直接绑定
+        self.file_url = (
+            QUrl.fromLocalFile(os.path.abspath(file_path)).toString() if file_path else ""
+        )
+        airport_code = kwargs.get("airport_code", "")
+        self.airport_code = sys.intern(airport_code) if airport_code else ""  # 所属机场代码
         self.thumbnail = kwargs.get("thumbnail", "")  # 缩略图路径
         self.metadata = kwargs.get("metadata", {})  # 其他元数据
 
@@ -32,6 +40,7 @@ class ChartModel(QAbstractListModel):
     FilePathRole = Qt.UserRole + 4
     AirportCodeRole = Qt.UserRole + 5
     ThumbnailRole = Qt.UserRole + 6
+    FileUrlRole = Qt.UserRole + 7
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -44,6 +53,10 @@ class ChartModel(QAbstractListModel):
         if not index.isValid() or index.row() >= len(self._charts):
             return None
 
+        # 只暴露自定义角色，DisplayRole 等内置角色直接返回
+        if role <= Qt.UserRole:
+            return None
+
         chart = self._charts[index.row()]
 
         if role == self.ChartIdRole:
@@ -58,6 +71,8 @@ class ChartModel(QAbstractListModel):
             return chart.airport_code
         elif role == self.ThumbnailRole:
             return chart.thumbnail
+        elif role == self.FileUrlRole:
+            return chart.file_url
 
         return None
 
@@ -69,20 +84,21 @@ class ChartModel(QAbstractListModel):
             self.FilePathRole: b"filePath",
             self.AirportCodeRole: b"airportCode",
             self.ThumbnailRole: b"thumbnail",
+            self.FileUrlRole: b"fileUrl",
         }
 
     def addChart(self, chart: Chart):
         """添加航图"""
-        self.beginInsertRows(self.index(len(self._charts)), len(self._charts), len(self._charts))
+        row = len(self._charts)
+        self.beginInsertRows(QModelIndex(), row, row)
         self._charts.append(chart)
         self.endInsertRows()
 
     def loadCharts(self, charts_data: List[Dict[str, Any]]):
         """从数据字典列表加载航图"""
         self.beginResetModel()
-        self._charts.clear()
-        for data in charts_data:
-            chart = Chart(
+        self._charts = [
+            Chart(
                 chart_id=data.get("chart_id", ""),
                 name=data.get("name", ""),
                 category=data.get("category", ""),
@@ -91,7 +107,8 @@ class ChartModel(QAbstractListModel):
                 thumbnail=data.get("thumbnail", ""),
                 metadata=data.get("metadata", {}),
             )
-            self._charts.append(chart)
+            for data in charts_data
+        ]
         self.endResetModel()
 
     def filterByCategory(self, category: str):
@@ -2,9 +2,18 @@
 Pin model for managing pinned charts
 """
 
+import sys
 from typing import Any, Dict, List
 
-from PySide6.QtCore import Property, QAbstractListModel, QObject, Qt, Signal, Slot
+from PySide6.QtCore import (
+    Property,
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    Signal,
+    Slot,
+)
 
 
 class PinnedChart:
@@ -14,8 +23,10 @@ class PinnedChart:
         self.chart_id = chart_id  # 航图ID
         self.name = name  # 航图名称
         self.file_path = file_path  # PDF 文件路径
-        self.airport_code = kwargs.get("airport_code", "")  # 所属机场代码
-        self.category = kwargs.get("category", "")  # 分类
+        airport_code = kwargs.get("airport_code", "")
+        category = kwargs.get("category", "")
+        self.airport_code = sys.intern(airport_code) if airport_code else ""  # 所属机场代码
+        self.category = sys.intern(category) if category else ""  # 分类
         self.thumbnail = kwargs.get("thumbnail", "")  # 缩略图路径
         self.pinned_at = kwargs.get("pinned_at", "")  # 固定时间
 
@@ -59,6 +70,10 @@ class PinModel(QAbstractListModel):
         if not index.isValid() or index.row() >= len(self._pinned_charts):
             return None
 
+        # 只暴露自定义角色，DisplayRole 等内置角色直接返回
+        if role <= Qt.UserRole:
+            return None
+
         chart = self._pinned_charts[index.row()]
 
         if role == self.ChartIdRole:
@@ -94,12 +109,13 @@ class PinModel(QAbstractListModel):
     def maxPins(self, value: int):
         if self._max_pins != value:
             self._max_pins = value
-            self.maxPinsChanged.emit(value)
             # 如果超出最大数量，移除多余的
+            # endRemoveRows 已通知视图，剩余行的数据未变化，无需再发出 dataChanged
             if len(self._pinned_charts) > value:
-                self.beginRemoveRows(self.index(value), value, len(self._pinned_charts) - 1)
-                self._pinned_charts = self._pinned_charts[:value]
+                self.beginRemoveRows(QModelIndex(), value, len(self._pinned_charts) - 1)
+                del self._pinned_charts[value:]
                 self.endRemoveRows()
+            self.maxPinsChanged.emit(value)
 
     @Slot(dict, result=bool)
     def pinChart(self, chart_data: Dict[str, Any]) -> bool:
@@ -124,9 +140,8 @@ class PinModel(QAbstractListModel):
             pinned_at=chart_data.get("pinned_at", ""),
         )
 
-        self.beginInsertRows(
-            self.index(len(self._pinned_charts)), len(self._pinned_charts), len(self._pinned_charts)
-        )
+        row = len(self._pinned_charts)
+        self.beginInsertRows(QModelIndex(), row, row)
         self._pinned_charts.append(pinned_chart)
         self.endInsertRows()
 
@@ -137,7 +152,7 @@ class PinModel(QAbstractListModel):
         """取消固定航图"""
         for i, chart in enumerate(self._pinned_charts):
             if chart.chart_id == chart_id:
-                self.beginRemoveRows(self.index(i), i, i)
+                self.beginRemoveRows(QModelIndex(), i, i)
                 self._pinned_charts.pop(i)
                 self.endRemoveRows()
                 return True
@@ -155,9 +170,8 @@ class PinModel(QAbstractListModel):
     def loadPinnedCharts(self, charts_data: List[Dict[str, Any]]):
         """从数据字典列表加载固定航图"""
         self.beginResetModel()
-        self._pinned_charts.clear()
-        for data in charts_data[: self._max_pins]:  # 限制最大数量
-            chart = PinnedChart(
+        self._pinned_charts = [
+            PinnedChart(
                 chart_id=data.get("chart_id", ""),
                 name=data.get("name", ""),
                 file_path=data.get("file_path", ""),
@@ -166,7 +180,8 @@ class PinModel(QAbstractListModel):
                 thumbnail=data.get("thumbnail", ""),
                 pinned_at=data.get("pinned_at", ""),
             )
-            self._pinned_charts.append(chart)
+            for data in charts_data[: self._max_pins]  # 限制最大数量
+        ]
         self.endResetModel()
 
     def clear(self):
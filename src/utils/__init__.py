@@ -2,10 +2,31 @@
 Utilities package for EAIP Viewer
 """
 
-from utils.chart_processor import ChartFile, ChartProcessor
-from utils.config import Config
-from utils.eaip_handler import EaipHandler
+from importlib import import_module
+
 from utils.logger import Logger
-from utils.zip_extractor import ZipExtractor
 
 __all__ = ["Config", "ZipExtractor", "ChartProcessor", "ChartFile", "EaipHandler", "Logger"]
+
+# 较重的子模块（PySide6 / PyMuPDF / PIL）按需加载，导入包时只加载 Logger
+_LAZY_EXPORTS = {
+    "ChartFile": "utils.chart_processor",
+    "ChartProcessor": "utils.chart_processor",
+    "Config": "utils.config",
+    "EaipHandler": "utils.eaip_handler",
+    "ZipExtractor": "utils.zip_extractor",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,15 +3,20 @@ EAIP Chart Processor
 处理 EAIP 航图数据:解压、重命名、分类、索引
 """
 
+import errno
 import json
+import logging
+import os
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 from utils.logger import Logger
 
+__all__ = ["ChartFile", "ChartProcessor", "IndexEntry"]
+
 logger = Logger.get_logger("ChartProcessor")
 
 try:
@@ -22,6 +27,11 @@ except ImportError:
     except ImportError:
         fitz = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class ChartFile:
@@ -38,10 +48,22 @@ class ChartFile:
         return Path(self.path) / self.name
 
 
+@dataclass(slots=True)
+class IndexEntry:
+    """index.json 中的单条航图索引"""
+
+    id: str
+    code: str
+    name: str
+    path: str
+    sort: str
+
+
 class ChartProcessor:
     """航图处理服务"""
 
-    CHART_TYPES = [
+    # 有序元组用于需要确定顺序的场景（如构建正则），frozenset 用于成员判断
+    CHART_TYPES_ORDERED: Tuple[str, ...] = (
         "ADC",
         "APDC",
         "GMC",
@@ -56,9 +78,24 @@ class ChartProcessor:
         "DATABASE CODING TABLE",
         "IAC",
         "ATCSMAC",
-    ]
+    )
+    CHART_TYPES: FrozenSet[str] = frozenset(CHART_TYPES_ORDERED)
 
-    SPECIAL_CHART_TYPES = ["WAYPOINT LIST", "GMC", "APDC", "DATABASE CODING TABLE"]
+    SPECIAL_CHART_TYPES_ORDERED: Tuple[str, ...] = (
+        "WAYPOINT LIST",
+        "GMC",
+        "APDC",
+        "DATABASE CODING TABLE",
+    )
+    SPECIAL_CHART_TYPES: FrozenSet[str] = frozenset(SPECIAL_CHART_TYPES_ORDERED)
+
+    # 航图类型匹配正则（长类型名在前，避免被其前缀类型抢先匹配）
+    _CHART_TYPE_RE = re.compile(
+        "|".join(sorted(map(re.escape, CHART_TYPES_ORDERED), key=len, reverse=True))
+    )
+
+    # 文件名中不允许的字符统一替换为 "-"
+    _SANITIZE = str.maketrans({":": "-", "/": "-", "\\": "-"})
 
     def __init__(
         self,
@@ -87,6 +124,9 @@ class ChartProcessor:
         self.ad_json_path = data_path / "Data" / "JsonPath" / "AD.JSON"
         self.enr_json_path = data_path / "Data" / "JsonPath" / "ENR.JSON"
 
+        # 已创建的目标目录，避免重命名时对同一目录重复 mkdir
+        self._mkdir_cache: Set[Path] = set()
+
         logger.debug(
             f"初始化 ChartProcessor: data_path={data_path}, dir_name={dir_name}, max_workers={self.max_workers}"
         )
@@ -99,19 +139,25 @@ class ChartProcessor:
         """验证路径有效性"""
         logger.debug(f"验证路径: data_path={self.data_path}")
 
-        if not self.data_path.exists():
-            logger.error(f"数据目录不存在: {self.data_path}")
-            return False
+        # 一次扫描 Terminal/ENROUTE 的父目录，代替逐个 exists() 检查
+        try:
+            with os.scandir(self.terminal_path.parent) as entries:
+                existing = {entry.name for entry in entries}
+        except FileNotFoundError:
+            if not self.data_path.exists():
+                logger.error(f"数据目录不存在: {self.data_path}")
+                return False
+            existing = set()
 
         logger.debug(f"数据目录存在: {self.data_path}")
 
-        if not self.terminal_path.exists():
+        if self.terminal_path.name not in existing:
             logger.warning(f"Terminal目录不存在: {self.terminal_path}")
             # 尝试创建
             self.terminal_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"已创建 Terminal 目录: {self.terminal_path}")
 
-        if not self.enroute_path.exists():
+        if self.enroute_path.name not in existing:
             logger.warning(f"ENROUTE目录不存在: {self.enroute_path}")
             # 尝试创建
             self.enroute_path.mkdir(parents=True, exist_ok=True)
@@ -146,11 +192,19 @@ class ChartProcessor:
         try:
             merged_doc = fitz.open()
             for pdf_path in pdf_files:
-                with fitz.open(str(pdf_path)) as doc:
+                with fitz.open(str(pdf_path), filetype="pdf") as doc:
                     merged_doc.insert_pdf(doc)
 
             merged_path = folder_path / f"{chart_type}-MERGED.pdf"
-            merged_doc.save(str(merged_path))
+            # garbage=4 合并各源文件中重复的字体/图像对象，并重新压缩数据流
+            merged_doc.save(
+                str(merged_path),
+                garbage=4,
+                deflate=True,
+                deflate_images=True,
+                deflate_fonts=True,
+                clean=True,
+            )
             merged_doc.close()
 
             print(f"[SUCCESS] PDF 合并成功: {merged_path}")
@@ -161,13 +215,94 @@ class ChartProcessor:
             return None
 
     def merge_special_charts(self, airport_path: Path) -> None:
-        """合并特殊类型图表"""
-        for chart_type in self.SPECIAL_CHART_TYPES:
+        """合并特殊类型图表（PyMuPDF 不是线程安全的，逐个类型串行合并）"""
+        for chart_type in self.SPECIAL_CHART_TYPES_ORDERED:
             type_folder = airport_path / chart_type
-            if type_folder.exists() and type_folder.is_dir():
+            if type_folder.is_dir():
                 print(f"[INFO] 处理特殊图表: {chart_type} at {type_folder}")
                 self.merge_pdfs(type_folder, chart_type)
 
+    @staticmethod
+    def _load_json(json_path: Path) -> Any:
+        """读取 JSON 文件（优先使用 orjson，直接解析字节）"""
+        if orjson is not None:
+            return orjson.loads(json_path.read_bytes())
+        with open(json_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _write_json(json_path: Path, data: Any) -> None:
+        """写入 JSON 文件（优先使用 orjson，一次性写入字节）"""
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=2, default=asdict)
+            payload = payload.encode("utf-8")
+        json_path.write_bytes(payload)
+
+    def _ensure_dir(self, directory: Path) -> None:
+        """创建目录（每个目录只调用一次 mkdir，可在线程池中调用）"""
+        if directory not in self._mkdir_cache:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._mkdir_cache.add(directory)
+
+    @staticmethod
+    def _scan_dir(path: Path) -> Tuple[List[str], List[str]]:
+        """
+        单次遍历目录，区分子文件夹和 PDF 文件
+
+        DirEntry 会缓存目录项类型，避免对每个文件再调用 stat()
+
+        Args:
+            path: 要扫描的目录
+
+        Returns:
+            (子文件夹名称列表, PDF 文件名列表)
+        """
+        subdirs: List[str] = []
+        pdf_names: List[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.lower().endswith(".pdf"):
+                    pdf_names.append(entry.name)
+        return subdirs, pdf_names
+
+    @staticmethod
+    def _iter_pdf_names(path: Path) -> Iterator[str]:
+        """逐个产出目录下的 PDF 文件名（不构建中间列表）"""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".pdf") and not entry.is_dir(follow_symlinks=False):
+                    yield entry.name
+
+    @staticmethod
+    def _rename_noreplace(src: str, dst: str) -> None:
+        """
+        重命名文件，目标已存在时抛出 FileExistsError 而不是覆盖
+
+        Args:
+            src: 源文件路径
+            dst: 目标文件路径
+        """
+        if os.name == "nt":
+            # Windows 上 os.rename 本身在目标存在时即失败
+            os.rename(src, dst)
+            return
+        try:
+            # link 在目标存在时原子地失败，成功后再删除源文件
+            os.link(src, dst)
+        except OSError as e:
+            if e.errno not in (errno.EPERM, errno.EOPNOTSUPP, errno.ENOSYS, errno.EXDEV):
+                raise
+            # 文件系统不支持硬链接（如 FAT）时退回到先检查再重命名
+            if os.path.lexists(dst):
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst) from e
+            os.rename(src, dst)
+            return
+        os.unlink(src)
+
     @staticmethod
     def get_icao_from_path(path: Path) -> Optional[str]:
         """从路径提取ICAO代码或航路图标识"""
@@ -187,6 +322,74 @@ class ChartProcessor:
         # 处理航路图
         self._rename_enroute_charts()
 
+    def _rename_one(self, old_path: Path, new_path: Path) -> bool:
+        """
+        重命名单个航图文件（在线程池中执行）
+
+        Args:
+            old_path: 原文件路径
+            new_path: 目标路径（所在目录不存在时才创建）
+
+        Returns:
+            是否重命名成功
+        """
+        # 不预先检查 old_path.exists()，由重命名本身报告文件缺失；
+        # 目标已存在时不覆盖，避免并行重命名时互相覆盖航图
+        try:
+            try:
+                self._rename_noreplace(str(old_path), str(new_path))
+            except FileNotFoundError:
+                # 源文件不存在时不创建目标目录，避免生成没有航图的空机场目录
+                if not old_path.exists():
+                    raise
+                self._ensure_dir(new_path.parent)
+                self._rename_noreplace(str(old_path), str(new_path))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"重命名航图: {old_path.name} -> {new_path.parent.name}/{new_path.name}"
+                )
+            return True
+        except FileNotFoundError:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"文件不存在: {old_path}")
+        except FileExistsError:
+            logger.warning(f"目标文件已存在，跳过重命名: {old_path} -> {new_path}")
+        except OSError as e:
+            logger.error(f"重命名失败: {old_path}, {e}")
+        return False
+
+    def _rename_batch(self, tasks: List[Tuple[Path, Path]], report_progress: bool = False) -> int:
+        """
+        使用线程池并行执行一批重命名任务
+
+        Args:
+            tasks: (原路径, 目标路径) 列表
+            report_progress: 是否通过 progress_callback 报告进度
+
+        Returns:
+            成功重命名的文件数量
+        """
+        renamed_count = 0
+        total = len(tasks)
+        step = max(1, total // 20)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._rename_one, old_path, new_path): new_path
+                for old_path, new_path in tasks
+            }
+
+            for completed, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    renamed_count += 1
+
+                # 报告进度
+                if report_progress and self.progress_callback and completed % step == 0:
+                    icao = futures[future].parent.name
+                    self.progress_callback(completed, total, f"重命名: {icao}")
+
+        return renamed_count
+
     def _rename_airport_charts(self) -> None:
         """重命名机场航图文件（基于 AD.JSON）"""
         logger.debug(f"开始重命名机场航图文件，JSON路径: {self.ad_json_path}")
@@ -196,14 +399,14 @@ class ChartProcessor:
             return
 
         try:
-            with open(self.ad_json_path, "r", encoding="utf-8") as file:
-                chart_data = json.load(file)
+            chart_data = self._load_json(self.ad_json_path)
             logger.info(f"读取机场航图数据: {len(chart_data)} 条记录")
 
-            renamed_count = 0
-            total_charts = len([c for c in chart_data if c.get("pdfPath")])
-
-            for idx, chart in enumerate(chart_data):
+            # 先解析出全部任务；目标目录在源文件确实存在时才由 _rename_one 创建
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            tasks: List[Tuple[Path, Path]] = []
+            targets: Set[Path] = set()
+            for chart in chart_data:
                 if not chart.get("pdfPath"):
                     continue
 
@@ -211,31 +414,22 @@ class ChartProcessor:
                 icao = self.get_icao_from_path(old_path)
 
                 if not icao or icao == "ENROUTE":
-                    logger.debug(f"跳过非机场航图: {old_path}")
+                    if debug_enabled:
+                        logger.debug(f"跳过非机场航图: {old_path}")
                     continue
 
-                new_name = (
-                    chart["name"].replace(":", "-").replace("/", "-").replace("\\", "-") + ".pdf"
-                )
+                new_name = chart["name"].translate(self._SANITIZE) + ".pdf"
+                new_path = self.terminal_path / icao / new_name
 
-                directory = self.terminal_path / icao
-                new_path = directory / new_name
-
-                if old_path.exists():
-                    try:
-                        new_path.parent.mkdir(parents=True, exist_ok=True)
-                        old_path.rename(new_path)
-                        renamed_count += 1
-                        logger.debug(f"重命名机场航图: {old_path.name} -> {icao}/{new_name}")
-
-                        # 报告进度
-                        if self.progress_callback and idx % max(1, total_charts // 20) == 0:
-                            self.progress_callback(idx + 1, total_charts, f"重命名: {icao}")
+                # 不同名称清理后可能得到同一文件名，并行执行时结果不确定，跳过重复项
+                if new_path in targets:
+                    logger.warning(f"目标文件名重复，跳过: {old_path} -> {icao}/{new_name}")
+                    continue
+                targets.add(new_path)
+                tasks.append((old_path, new_path))
 
-                    except OSError as e:
-                        logger.error(f"重命名失败: {old_path}, {e}")
-                else:
-                    logger.debug(f"文件不存在: {old_path}")
+            total_charts = len(tasks)
+            renamed_count = self._rename_batch(tasks, report_progress=True)
 
             # 确保最后报告100%
             if self.progress_callback:
@@ -255,33 +449,28 @@ class ChartProcessor:
             return
 
         try:
-            with open(self.enr_json_path, "r", encoding="utf-8") as file:
-                chart_data = json.load(file)
+            chart_data = self._load_json(self.enr_json_path)
             logger.info(f"读取航路图数据: {len(chart_data)} 条记录")
 
-            renamed_count = 0
+            self._ensure_dir(self.enroute_path)
+            tasks: List[Tuple[Path, Path]] = []
+            targets: Set[Path] = set()
             for chart in chart_data:
                 if not chart.get("pdfPath"):
                     continue
 
                 old_path = self.data_path / chart["pdfPath"].lstrip("/")
 
-                new_name = (
-                    chart["name"].replace(":", "-").replace("/", "-").replace("\\", "-") + ".pdf"
-                )
-
+                new_name = chart["name"].translate(self._SANITIZE) + ".pdf"
                 new_path = self.enroute_path / new_name
 
-                if old_path.exists():
-                    try:
-                        new_path.parent.mkdir(parents=True, exist_ok=True)
-                        old_path.rename(new_path)
-                        renamed_count += 1
-                        logger.debug(f"重命名航路图: {old_path.name} -> ENROUTE/{new_name}")
-                    except OSError as e:
-                        logger.error(f"重命名失败: {old_path}, {e}")
-                else:
-                    logger.debug(f"文件不存在: {old_path}")
+                if new_path in targets:
+                    logger.warning(f"目标文件名重复，跳过: {old_path} -> {new_name}")
+                    continue
+                targets.add(new_path)
+                tasks.append((old_path, new_path))
+
+            renamed_count = self._rename_batch(tasks)
 
             logger.info(f"航路图重命名完成，共处理 {renamed_count} 个文件")
 
@@ -297,31 +486,89 @@ class ChartProcessor:
                 logger.error(f"Terminal 目录不存在: {self.terminal_path}")
                 return
 
-            airports = [d for d in self.terminal_path.iterdir() if d.is_dir()]
+            airports, _ = self._scan_dir(self.terminal_path)
             logger.info(f"开始整理机场文件，机场数量: {len(airports)}")
 
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             moved_count = 0
-            for airport in airports:
-                airport_path = self.terminal_path / airport.name
-                pdf_files = list(airport_path.glob("*.pdf"))
-                logger.debug(f"处理机场 {airport.name}，PDF 文件数: {len(pdf_files)}")
-
-                for pdf_file in pdf_files:
-                    for chart_type in self.CHART_TYPES:
-                        if chart_type in pdf_file.name:
-                            type_folder = airport_path / chart_type
-                            type_folder.mkdir(parents=True, exist_ok=True)
-                            new_path = type_folder / pdf_file.name
-                            pdf_file.rename(new_path)
-                            moved_count += 1
-                            logger.debug(f"移动文件: {pdf_file.name} -> {chart_type}/")
-                            break
+            for airport_name in airports:
+                airport_path = self.terminal_path / airport_name
+                _, pdf_names = self._scan_dir(airport_path)
+                if debug_enabled:
+                    logger.debug(f"处理机场 {airport_name}，PDF 文件数: {len(pdf_names)}")
+
+                # 先确定每个文件的分类，再按需一次性创建分类文件夹
+                moves: List[Tuple[str, str]] = []
+                for pdf_name in pdf_names:
+                    match = self._CHART_TYPE_RE.search(pdf_name)
+                    if match:
+                        moves.append((pdf_name, match.group(0)))
+
+                for chart_type in {chart_type for _, chart_type in moves}:
+                    (airport_path / chart_type).mkdir(exist_ok=True)
+
+                airport_dir = str(airport_path)
+                for pdf_name, chart_type in moves:
+                    try:
+                        self._rename_noreplace(
+                            os.path.join(airport_dir, pdf_name),
+                            os.path.join(airport_dir, chart_type, pdf_name),
+                        )
+                    except FileNotFoundError:
+                        continue
+                    except FileExistsError:
+                        logger.warning(f"分类文件夹中已存在同名文件，跳过: {chart_type}/{pdf_name}")
+                        continue
+                    moved_count += 1
+                    if debug_enabled:
+                        logger.debug(f"移动文件: {pdf_name} -> {chart_type}/")
 
             logger.info(f"整理完成，共移动 {moved_count} 个文件")
 
         except Exception as e:
             logger.error(f"整理文件失败: {e}", exc_info=True)
 
+    def _cached_index_count(self, airport_path: Path) -> Optional[int]:
+        """
+        检查机场索引是否仍然有效
+
+        比较 index.json 与机场目录、各子文件夹及其中文件的最新修改时间，
+        索引不早于它们时说明目录内容未变化，可跳过合并和重新生成
+
+        Args:
+            airport_path: 机场目录路径
+
+        Returns:
+            有效时返回索引中的图表数量，否则返回 None
+        """
+        index_file = airport_path / "index.json"
+        try:
+            index_mtime = index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        newest = airport_path.stat().st_mtime_ns
+        with os.scandir(airport_path) as entries:
+            for entry in entries:
+                if entry.name == "index.json":
+                    continue
+                newest = max(newest, entry.stat(follow_symlinks=False).st_mtime_ns)
+                if entry.is_dir(follow_symlinks=False):
+                    with os.scandir(entry.path) as sub_entries:
+                        for sub_entry in sub_entries:
+                            newest = max(newest, sub_entry.stat(follow_symlinks=False).st_mtime_ns)
+
+        if newest > index_mtime:
+            return None
+
+        # 索引损坏（如写入中断）时视为无效，重新生成
+        try:
+            index = self._load_json(index_file)
+        except ValueError:
+            logger.warning(f"机场索引损坏，重新生成: {index_file}")
+            return None
+        return len(index) if isinstance(index, list) else None
+
     def _generate_airport_index(self, airport_path: Path) -> tuple:
         """
         为单个机场生成索引（用于多线程）
@@ -336,58 +583,58 @@ class ChartProcessor:
         logger.debug(f"处理机场 {airport_name}")
 
         try:
+            # 索引已是最新时直接复用，避免重复合并 PDF
+            cached_count = self._cached_index_count(airport_path)
+            if cached_count is not None:
+                logger.debug(f"机场索引已是最新，跳过: {airport_name}")
+                return (airport_name, cached_count)
+
             self.merge_special_charts(airport_path)
 
-            index_entries: List[Dict[str, str]] = []
+            index_entries: List[IndexEntry] = []
             chart_id = 1
 
-            # 处理根目录下的PDF文件
-            root_pdfs = list(airport_path.glob("*.pdf"))
-            logger.debug(f"  根目录 PDF: {len(root_pdfs)} 个")
-
-            for pdf_file in root_pdfs:
-                path = pdf_file.name.replace("\\", "/")
-                index_entries.append(
-                    {
-                        "id": str(chart_id),
-                        "code": "general",
-                        "name": pdf_file.name,
-                        "path": path,
-                        "sort": "general",
-                    }
-                )
-                chart_id += 1
+            # 单次扫描机场目录：根目录 PDF 直接生成索引，子文件夹留待后续处理
+            folders: List[str] = []
+            with os.scandir(airport_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.name)
+                    elif entry.name.lower().endswith(".pdf"):
+                        pdf_name = entry.name
+                        path = pdf_name.replace("\\", "/")
+                        index_entries.append(
+                            IndexEntry(str(chart_id), "general", pdf_name, path, "general")
+                        )
+                        chart_id += 1
+
+            logger.debug(f"  根目录 PDF: {chart_id - 1} 个")
 
             # 处理子文件夹中的PDF文件
-            folders = [f for f in airport_path.iterdir() if f.is_dir()]
             logger.debug(f"  子文件夹: {len(folders)} 个")
+            airport_prefix = f"{airport_name}-"
 
-            for folder in folders:
-                folder_pdfs = list(folder.glob("*.pdf"))
-                logger.debug(f"    {folder.name}: {len(folder_pdfs)} 个 PDF")
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            for folder_name in folders:
+                folder_start_id = chart_id
 
-                for pdf_file in folder_pdfs:
-                    path = f"{folder.name}/{pdf_file.name}".replace("\\", "/")
+                for pdf_name in self._iter_pdf_names(airport_path / folder_name):
+                    path = f"{folder_name}/{pdf_name}".replace("\\", "/")
                     # 提取 code（去掉机场代码前缀）
-                    code = pdf_file.name.split(folder.name)[0]
-                    if f"{airport_name}-" in code:
-                        code = code.split(f"{airport_name}-")[-1]
+                    code, _, _ = pdf_name.partition(folder_name)
+                    if airport_prefix in code:
+                        code = code.rpartition(airport_prefix)[2]
 
                     index_entries.append(
-                        {
-                            "id": str(chart_id),
-                            "code": code.strip(),
-                            "name": pdf_file.name,
-                            "path": path,
-                            "sort": folder.name,
-                        }
+                        IndexEntry(str(chart_id), code.strip(), pdf_name, path, folder_name)
                     )
                     chart_id += 1
 
+                if debug_enabled:
+                    logger.debug(f"    {folder_name}: {chart_id - folder_start_id} 个 PDF")
+
             # 保存索引文件
-            index_file = airport_path / "index.json"
-            with open(index_file, "w", encoding="utf-8") as f:
-                json.dump(index_entries, f, ensure_ascii=False, indent=4)
+            self._write_json(airport_path / "index.json", index_entries)
 
             return (airport_name, len(index_entries))
 
@@ -402,7 +649,8 @@ class ChartProcessor:
         try:
             # 生成机场索引（使用多线程）
             if self.terminal_path.exists():
-                airports = [d for d in self.terminal_path.iterdir() if d.is_dir()]
+                airport_names, _ = self._scan_dir(self.terminal_path)
+                airports = [self.terminal_path / name for name in airport_names]
                 total_airports = len(airports)
                 logger.info(f"找到 {total_airports} 个机场目录")
 
@@ -435,29 +683,17 @@ class ChartProcessor:
             # 生成航路图索引
             if self.enroute_path.exists():
                 logger.debug("生成航路图索引")
-                index_entries: List[Dict[str, str]] = []
-                chart_id = 1
-
                 # 处理 ENROUTE 目录下的所有 PDF 文件
-                enroute_pdfs = list(self.enroute_path.glob("*.pdf"))
-                logger.debug(f"  航路图 PDF: {len(enroute_pdfs)} 个")
-
-                for pdf_file in enroute_pdfs:
-                    index_entries.append(
-                        {
-                            "id": str(chart_id),
-                            "code": "enroute",
-                            "name": pdf_file.name,
-                            "path": pdf_file.name.replace("\\", "/"),
-                            "sort": "enroute",
-                        }
+                index_entries = [
+                    IndexEntry(
+                        str(chart_id), "enroute", pdf_name, pdf_name.replace("\\", "/"), "enroute"
                     )
-                    chart_id += 1
+                    for chart_id, pdf_name in enumerate(self._iter_pdf_names(self.enroute_path), 1)
+                ]
+                logger.debug(f"  航路图 PDF: {len(index_entries)} 个")
 
                 # 保存航路图索引文件
-                index_file = self.enroute_path / "index.json"
-                with open(index_file, "w", encoding="utf-8") as f:
-                    json.dump(index_entries, f, ensure_ascii=False, indent=4)
+                self._write_json(self.enroute_path / "index.json", index_entries)
 
                 logger.info(f"航路图索引生成完成，图表数量: {len(index_entries)}")
             else:
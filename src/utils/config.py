@@ -2,21 +2,33 @@
 Configuration Manager - 配置管理
 """
 
+import atexit
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
-from PySide6.QtCore import Property, QObject, Signal, Slot
+from PySide6.QtCore import Property, QCoreApplication, QObject, QTimer, Signal, Slot
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .path_helper import get_app_root, get_config_file_path, resolve_relative_path
 
+# get() 缓存中表示"配置项不存在"的标记
+_MISSING = object()
+
 
 class Config(QObject):
     """配置管理器"""
 
     configChanged = Signal(str, object)  # 配置项名称, 新值
 
+    # 属性修改后延迟保存的时间（毫秒），连续修改只写一次文件
+    SAVE_DELAY_MS = 300
+
     # 默认配置
     DEFAULT_CONFIG = {
         "data_path": "./data",
@@ -32,6 +44,9 @@ class Config(QObject):
         },
     }
 
+    # DEFAULT_CONFIG 中嵌套一层的配置项（合并配置时逐项合并）
+    NESTED_KEYS = ("theme", "splash_screen", "import")
+
     def __init__(self, config_file: str = "./config/settings.json", parent=None):
         super().__init__(parent)
         # 使用 path_helper 解析路径，支持打包和开发环境
@@ -40,37 +55,84 @@ class Config(QObject):
         else:
             self._config_file = resolve_relative_path(config_file)
         self._config: Dict[str, Any] = {}
-        self.load()
+        # get() 的结果缓存：key -> (配置版本号, 值)，load/set/reset 时递增版本号使其失效
+        self._version = 0
+        self._get_cache: Dict[str, Tuple[int, Any]] = {}
+        self._key_parts_cache: Dict[str, List[str]] = {}
+
+        # 延迟保存：QML 属性修改合并为一次写入，退出时同步写入未保存的修改
+        self._save_pending = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_save)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._flush_save)
+        atexit.register(self._flush_save)
+
+        # 配置文件在首次访问时才读取，不拖慢启动
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        """首次访问配置时从文件加载"""
+        if not self._loaded:
+            self.load()
 
     def load(self):
         """从文件加载配置"""
+        self._loaded = True
+        self._version += 1
         if self._config_file.exists():
             try:
-                with open(self._config_file, "r", encoding="utf-8") as f:
-                    self._config = json.load(f)
-                    # 合并默认配置（处理新增的配置项）
-                    self._config = self._merge_config(self.DEFAULT_CONFIG, self._config)
+                if orjson is not None:
+                    self._config = orjson.loads(self._config_file.read_bytes())
+                else:
+                    with open(self._config_file, "r", encoding="utf-8") as f:
+                        self._config = json.load(f)
+                # 合并默认配置（处理新增的配置项）
+                self._config = self._merge_config(self.DEFAULT_CONFIG, self._config)
             except Exception as e:
                 print(f"加载配置失败: {e}")
-                self._config = self.DEFAULT_CONFIG.copy()
+                self._config = self._merge_config(self.DEFAULT_CONFIG, {})
         else:
             # 使用默认配置
-            self._config = self.DEFAULT_CONFIG.copy()
+            self._config = self._merge_config(self.DEFAULT_CONFIG, {})
             # 创建配置文件
             self.save()
 
     def save(self):
-        """保存配置到文件"""
+        """保存配置到文件（先写临时文件再替换，避免写入中断损坏配置）"""
+        self._ensure_loaded()
+        self._save_pending = False
         try:
             # 确保目录存在
             self._config_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self._config_file, "w", encoding="utf-8") as f:
-                json.dump(self._config, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(
+                    self._config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            else:
+                payload = json.dumps(self._config, ensure_ascii=False, indent=2).encode("utf-8")
+
+            tmp_file = self._config_file.with_name(self._config_file.name + ".tmp")
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self._config_file)
 
         except Exception as e:
             print(f"保存配置失败: {e}")
 
+    def _schedule_save(self):
+        """延迟保存配置（SAVE_DELAY_MS 内的多次修改只写一次文件）"""
+        self._save_pending = True
+        self._save_timer.start()
+
+    def _flush_save(self):
+        """立即写入尚未保存的修改"""
+        if self._save_pending:
+            self.save()
+
     def _merge_config(self, default: dict, user: dict) -> dict:
         """
         合并配置（保留用户配置，添加默认配置中的新项）
@@ -82,12 +144,15 @@ class Config(QObject):
         Returns:
             合并后的配置
         """
-        result = default.copy()
-        for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_config(result[key], value)
-            else:
-                result[key] = value
+        result = {**default, **user}
+        # 默认配置只有一层嵌套，逐个合并已知的嵌套项即可，无需递归；
+        # 嵌套项总是生成新字典，避免后续 set() 修改到 DEFAULT_CONFIG
+        for key in self.NESTED_KEYS:
+            value = user.get(key)
+            if value is None:
+                result[key] = dict(default[key])
+            elif isinstance(value, dict):
+                result[key] = {**default[key], **value}
         return result
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -101,26 +166,46 @@ class Config(QObject):
         Returns:
             配置值
         """
-        keys = key.split(".")
-        value = self._config
+        self._ensure_loaded()
+        entry = self._get_cache.get(key)
+        if entry is not None and entry[0] == self._version:
+            value = entry[1]
+            return default if value is _MISSING else value
 
-        for k in keys:
+        value = self._config
+        for k in self._key_parts(key):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
-                return default
+                value = _MISSING
+                break
+
+        self._get_cache[key] = (self._version, value)
+        return default if value is _MISSING else value
 
-        return value
+    def _key_parts(self, key: str) -> List[str]:
+        """拆分点号分隔的配置键（结果缓存）"""
+        parts = self._key_parts_cache.get(key)
+        if parts is None:
+            parts = self._key_parts_cache[key] = key.split(".")
+        return parts
 
-    def set(self, key: str, value: Any):
+    def set(self, key: str, value: Any) -> bool:
         """
         设置配置值
 
         Args:
             key: 配置键（支持点号分隔的嵌套键）
             value: 配置值
+
+        Returns:
+            配置值是否发生变化（未变化时不触发 configChanged）
         """
-        keys = key.split(".")
+        self._ensure_loaded()
+        if self.get(key, _MISSING) == value:
+            return False
+
+        keys = self._key_parts(key)
         config = self._config
 
         # 遍历到倒数第二层
@@ -131,11 +216,15 @@ class Config(QObject):
 
         # 设置值
         config[keys[-1]] = value
+        self._version += 1
         self.configChanged.emit(key, value)
+        return True
 
     def reset(self):
         """重置为默认配置"""
-        self._config = self.DEFAULT_CONFIG.copy()
+        self._loaded = True
+        self._config = self._merge_config(self.DEFAULT_CONFIG, {})
+        self._version += 1
         self.save()
 
     # QML 属性
@@ -145,8 +234,8 @@ class Config(QObject):
 
     @language.setter
     def language(self, value: str):
-        self.set("language", value)
-        self.save()
+        if self.set("language", value):
+            self._schedule_save()
 
     @Property(str)
     def themeMode(self):
@@ -154,8 +243,8 @@ class Config(QObject):
 
     @themeMode.setter
     def themeMode(self, value: str):
-        self.set("theme.mode", value)
-        self.save()
+        if self.set("theme.mode", value):
+            self._schedule_save()
 
     @Property(str)
     def accentColor(self):
@@ -163,8 +252,8 @@ class Config(QObject):
 
     @accentColor.setter
     def accentColor(self, value: str):
-        self.set("theme.accent_color", value)
-        self.save()
+        if self.set("theme.accent_color", value):
+            self._schedule_save()
 
     @Property(int)
     def maxPins(self):
@@ -172,8 +261,8 @@ class Config(QObject):
 
     @maxPins.setter
     def maxPins(self, value: int):
-        self.set("max_pins", value)
-        self.save()
+        if self.set("max_pins", value):
+            self._schedule_save()
 
     @Property(bool)
     def splashScreenEnabled(self):
@@ -181,8 +270,8 @@ class Config(QObject):
 
     @splashScreenEnabled.setter
     def splashScreenEnabled(self, value: bool):
-        self.set("splash_screen.enabled", value)
-        self.save()
+        if self.set("splash_screen.enabled", value):
+            self._schedule_save()
 
     @Slot(result=int)
     def getImportWorkers(self) -> int:
@@ -220,14 +309,15 @@ class Config(QObject):
             workers: 工作线程数，0 表示自动
         """
         if workers == 0:
-            self.set("import.max_workers", "auto")
+            changed = self.set("import.max_workers", "auto")
         else:
             cpu_count = os.cpu_count() or 4
             max_allowed = int(cpu_count * 0.7)
             workers = min(workers, max_allowed)
             workers = max(1, workers)
-            self.set("import.max_workers", workers)
-        self.save()
+            changed = self.set("import.max_workers", workers)
+        if changed:
+            self._schedule_save()
 
     @Slot(result=int)
     def getMaxImportWorkers(self) -> int:
@@ -4,9 +4,13 @@ EAIP Handler - EAIP 数据查询和处理核心
 
 import io
 import json
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from PIL import Image
 
@@ -22,13 +26,30 @@ except ImportError:
     except ImportError:
         fitz = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from utils.chart_processor import ChartProcessor
 
 
 class EaipHandler:
     """EAIP 数据处理器"""
 
-    def __init__(self, data_path: Path, airac_period: str = "2505", dir_name: str = "EAIP"):
+    # 渲染结果缓存的总字节数上限（多页 PDF 原样缓存，单份可能有几十 MB，因此按字节而非条目数限制）
+    RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    # 跑道号（如 "36"、"18L"），用于区分按跑道还是按航图类型筛选
+    _RUNWAY_RE = re.compile(r"^\d{2}[LRC]?$")
+
+    def __init__(
+        self,
+        data_path: Path,
+        airac_period: str = "2505",
+        dir_name: str = "EAIP",
+        max_workers: int = 4,
+    ):
         """
         初始化 EAIP 处理器
 
@@ -36,13 +57,23 @@ class EaipHandler:
             data_path: 数据根目录
             airac_period: AIRAC 周期（如 "2505"）
             dir_name: EAIP 文件夹名称
+            max_workers: 读取索引 / 处理航图时的最大工作线程数
         """
         self.data_path = data_path
         self.airac_period = airac_period
         self.dir_name = dir_name
+        self.max_workers = max(1, max_workers)  # 至少1个线程
         self.base_path = data_path / airac_period
         # 更新为新的路径结构（导入后已移动到根目录）
         self.terminal_path = self.base_path / "Terminal"
+        # 已解析的 index.json：icao -> (mtime_ns, 航图列表, 按 ID 索引, 按大写代码索引)
+        self._index_cache: Dict[str, Tuple[int, List[Dict], Dict[str, Dict], Dict[str, Dict]]] = {}
+        # Terminal 下的机场目录：icao -> 路径（update_period 时生成，查询未命中时重新扫描）
+        self._airport_paths: Dict[str, Path] = {}
+        # 渲染结果 LRU 缓存：(路径, mtime_ns, 缩放比例) -> 字节数据
+        self._render_cache: "OrderedDict[Tuple[str, int, float], bytes]" = OrderedDict()
+        self._render_cache_bytes = 0
+        self._render_lock = threading.Lock()
 
     def auto_detect_dir_name(self) -> Optional[str]:
         """自动检测 EAIP 文件夹名称"""
@@ -50,25 +81,30 @@ class EaipHandler:
             target_path = self.base_path / "Data"
             logger.debug(f"自动检测 EAIP 目录: {target_path}")
 
-            if not target_path.exists():
+            # 查找 EAIP 开头的文件夹（先按名称过滤，再判断是否为目录）
+            entry_count = 0
+            eaip_dirs = []
+            try:
+                with os.scandir(target_path) as it:
+                    for entry in it:
+                        entry_count += 1
+                        if entry.name.startswith("EAIP") and entry.is_dir():
+                            eaip_dirs.append(entry.name)
+            except FileNotFoundError:
                 logger.error(f"数据目录不存在: {target_path}")
                 return None
 
-            # 查找 EAIP 开头的文件夹
-            all_dirs = list(target_path.iterdir())
-            logger.debug(f"Data 目录下共有 {len(all_dirs)} 个项目")
-
-            eaip_dirs = [d for d in all_dirs if d.is_dir() and d.name.startswith("EAIP")]
+            logger.debug(f"Data 目录下共有 {entry_count} 个项目")
 
             logger.debug(f"找到 {len(eaip_dirs)} 个 EAIP 文件夹")
             if eaip_dirs:
-                logger.debug(f"EAIP 文件夹列表: {[d.name for d in eaip_dirs]}")
+                logger.debug(f"EAIP 文件夹列表: {eaip_dirs}")
 
             if not eaip_dirs:
                 logger.warning(f"未找到 EAIP 文件夹: {target_path}")
                 return None
 
-            detected_dir = eaip_dirs[0].name
+            detected_dir = eaip_dirs[0]
             logger.info(f"检测到 EAIP 文件夹: {detected_dir}")
             return detected_dir
 
@@ -92,6 +128,8 @@ class EaipHandler:
         try:
             self.airac_period = period
             self.base_path = self.data_path / period
+            self._index_cache.clear()
+            self._airport_paths = {}
 
             # 更新为新的路径结构
             self.terminal_path = self.base_path / "Terminal"
@@ -103,40 +141,32 @@ class EaipHandler:
             if not self.terminal_path.exists():
                 return {"success": False, "message": f"Terminal 目录不存在: {self.terminal_path}"}
 
-            # 检查是否需要生成索引
-            need_update = False
-            for airport_dir in self.terminal_path.iterdir():
-                if airport_dir.is_dir():
-                    index_path = airport_dir / "index.json"
-                    if not index_path.exists():
-                        need_update = True
-                        break
-
-            # 如果需要，执行处理
-            if need_update:
+            # 检查是否需要生成索引，如果需要，执行处理
+            if self._needs_reindex():
                 print("[INFO] 检测到缺少索引文件，开始处理...")
-                processor = ChartProcessor(self.base_path, self.dir_name)
+                processor = ChartProcessor(self.base_path, self.dir_name, self.max_workers)
                 processor.process(["rename", "organize", "index"])
 
-            # 统计信息
-            airports = [d for d in self.terminal_path.iterdir() if d.is_dir()]
+            # 统计信息（index.json 的读取受 I/O 延迟限制，并行读取）
+            self._airport_paths = self._scan_airport_dirs()
             total_charts = 0
             airport_info = []
 
-            for airport in airports:
-                index_path = airport / "index.json"
-                if index_path.exists():
-                    with open(index_path, "r", encoding="utf-8") as f:
-                        charts = json.load(f)
-                        chart_count = len(charts)
+            if self._airport_paths:
+                workers = min(self.max_workers, len(self._airport_paths))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    counts = list(executor.map(self._count_charts, self._airport_paths.values()))
+
+                for icao, chart_count in zip(self._airport_paths, counts):
+                    if chart_count is not None:
                         total_charts += chart_count
-                        airport_info.append({"icao": airport.name, "charts": chart_count})
+                        airport_info.append({"icao": icao, "charts": chart_count})
 
             return {
                 "success": True,
                 "airac_period": self.airac_period,
                 "dir_name": self.dir_name,
-                "total_airports": len(airports),
+                "total_airports": len(self._airport_paths),
                 "total_charts": total_charts,
                 "airports": airport_info,
             }
@@ -145,6 +175,110 @@ class EaipHandler:
             print(f"[ERROR] 更新周期失败: {e}")
             return {"success": False, "message": f"更新失败: {e}"}
 
+    def _needs_reindex(self) -> bool:
+        """是否存在缺少 index.json 的机场目录（遇到第一个即返回）"""
+        with os.scandir(self.terminal_path) as it:
+            return any(
+                entry.is_dir() and not os.path.isfile(os.path.join(entry.path, "index.json"))
+                for entry in it
+            )
+
+    @staticmethod
+    def _read_index(index_path: Path) -> List[Dict]:
+        """读取 index.json（优先使用 orjson，直接解析字节）"""
+        if orjson is not None:
+            return orjson.loads(index_path.read_bytes())
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _count_charts(self, airport_path: Path) -> Optional[int]:
+        """
+        统计机场索引中的航图数量（在线程池中执行）
+
+        Args:
+            airport_path: 机场目录
+
+        Returns:
+            航图数量，索引文件不存在时返回 None
+        """
+        try:
+            return len(self._read_index(airport_path / "index.json"))
+        except FileNotFoundError:
+            return None
+
+    def _scan_airport_dirs(self) -> Dict[str, Path]:
+        """
+        扫描 Terminal 下的机场目录（os.scandir 的目录判断通常无需额外 stat）
+
+        Returns:
+            icao -> 机场目录路径，Terminal 不存在时为空字典
+        """
+        try:
+            with os.scandir(self.terminal_path) as it:
+                return {
+                    entry.name: Path(entry.path)
+                    for entry in it
+                    if entry.is_dir(follow_symlinks=False)
+                }
+        except FileNotFoundError:
+            return {}
+
+    def _get_airport_path(self, icao: str) -> Optional[Path]:
+        """
+        查找机场目录
+
+        Args:
+            icao: 机场 ICAO 代码
+
+        Returns:
+            机场目录路径，不存在时返回 None
+        """
+        airport_path = self._airport_paths.get(icao)
+        if airport_path is None:
+            # 未命中时重新扫描一次（机场目录可能是之后才生成的）
+            self._airport_paths = self._scan_airport_dirs()
+            airport_path = self._airport_paths.get(icao)
+        return airport_path
+
+    def _load_index(
+        self, icao: str
+    ) -> Optional[Tuple[List[Dict], Dict[str, Dict], Dict[str, Dict]]]:
+        """
+        读取机场 index.json，文件未变化时复用已解析的结果
+
+        Args:
+            icao: 机场 ICAO 代码
+
+        Returns:
+            (航图列表, 按 ID 索引, 按大写代码索引)，索引文件不存在时返回 None
+        """
+        airport_path = self._get_airport_path(icao)
+        if airport_path is None:
+            return None
+
+        index_path = airport_path / "index.json"
+        try:
+            mtime_ns = index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._index_cache.pop(icao, None)
+            return None
+
+        cached = self._index_cache.get(icao)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1:]
+
+        data = self._read_index(index_path)
+
+        # 与原先的线性查找一致：重复的 ID / 代码以第一条为准
+        by_id: Dict[str, Dict] = {}
+        by_code: Dict[str, Dict] = {}
+        for chart in data:
+            by_id.setdefault(str(chart["id"]), chart)
+            by_code.setdefault(chart.get("code", "").upper(), chart)
+
+        self._index_cache[icao] = (mtime_ns, data, by_id, by_code)
+        return data, by_id, by_code
+
     def get_chart_list(
         self, icao: str, search_type: str = None, code: str = None, filename: str = None
     ) -> Optional[List[Dict]]:
@@ -161,29 +295,27 @@ class EaipHandler:
             航图列表或 None
         """
         try:
-            airport_path = self.terminal_path / icao
-            if not airport_path.exists():
-                return None
-
-            index_path = airport_path / "index.json"
-            if not index_path.exists():
+            index = self._load_index(icao)
+            if index is None:
                 return None
 
-            with open(index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = index[0]
 
             # 筛选
             if code:
-                data = [x for x in data if x.get("code", "").upper() == code.upper()]
+                code_upper = code.upper()
+                data = [x for x in data if x.get("code", "").upper() == code_upper]
             elif filename:
-                data = [x for x in data if filename.lower() in x["name"].lower()]
+                filename_lower = filename.lower()
+                data = [x for x in data if filename_lower in x["name"].lower()]
             elif search_type:
-                if re.match(r"^\d{2}[LRC]?$", search_type):  # 跑道号
+                if self._RUNWAY_RE.match(search_type):  # 跑道号
                     data = [x for x in data if search_type in x["name"]]
                 else:  # 航图类型
                     data = [x for x in data if x["sort"] == search_type]
 
-            return data if data else None
+            # 只复制筛选结果：调用方会改写其中的 path 字段，不能污染缓存
+            return [dict(x) for x in data] if data else None
 
         except Exception as e:
             print(f"[ERROR] 获取航图列表失败: {e}")
@@ -201,18 +333,15 @@ class EaipHandler:
             图片字节或错误信息
         """
         try:
-            airport_path = self.terminal_path / icao
-            if not airport_path.exists():
+            airport_path = self._get_airport_path(icao)
+            if airport_path is None:
                 return f"No charts found for airport {icao}"
 
-            index_path = airport_path / "index.json"
-            if not index_path.exists():
+            index = self._load_index(icao)
+            if index is None:
                 return "Index file not found"
 
-            with open(index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            chart = next((x for x in data if str(x["id"]) == str(doc_id)), None)
+            chart = index[1].get(str(doc_id))
             if not chart:
                 return f"Chart with ID {doc_id} not found"
 
@@ -238,18 +367,15 @@ class EaipHandler:
             图片字节或错误信息
         """
         try:
-            airport_path = self.terminal_path / icao
-            if not airport_path.exists():
+            airport_path = self._get_airport_path(icao)
+            if airport_path is None:
                 return f"No charts found for airport {icao}"
 
-            index_path = airport_path / "index.json"
-            if not index_path.exists():
+            index = self._load_index(icao)
+            if index is None:
                 return "Index file not found"
 
-            with open(index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            chart = next((x for x in data if x.get("code", "").upper() == code.upper()), None)
+            chart = index[2].get(code.upper())
             if not chart:
                 return f"Chart with code {code} not found"
 
@@ -273,44 +399,98 @@ class EaipHandler:
 
         Returns:
             图片字节数据或 PDF 字节数据
+
+        说明:
+            结果按 (路径, 修改时间, 缩放比例) 缓存，总大小不超过 RENDER_CACHE_MAX_BYTES
         """
         if fitz is None:
             raise Exception("PyMuPDF 未安装，无法转换 PDF")
 
         try:
-            doc = fitz.open(str(pdf_path))
-
-            # 如果 ≥3 页，直接返回 PDF
-            if len(doc) >= 3:
-                doc.close()
-                with open(pdf_path, "rb") as f:
-                    return f.read()
-
-            # <3 页时，将每页渲染为图片并拼接
-            mat = fitz.Matrix(zoom, zoom)
-            images = []
+            key = (str(pdf_path), pdf_path.stat().st_mtime_ns, zoom)
+            with self._render_lock:
+                cached = self._render_cache.get(key)
+                if cached is not None:
+                    self._render_cache.move_to_end(key)
+                    return cached
+
+            result = self._render_pdf(pdf_path, zoom)
+
+            # 超过上限的单个结果不缓存
+            if len(result) <= self.RENDER_CACHE_MAX_BYTES:
+                with self._render_lock:
+                    previous = self._render_cache.pop(key, None)
+                    if previous is not None:
+                        self._render_cache_bytes -= len(previous)
+                    self._render_cache[key] = result
+                    self._render_cache_bytes += len(result)
+                    while self._render_cache_bytes > self.RENDER_CACHE_MAX_BYTES:
+                        _, evicted = self._render_cache.popitem(last=False)
+                        self._render_cache_bytes -= len(evicted)
+            return result
 
-            for page in doc:
-                pix = page.get_pixmap(matrix=mat, colorspace="rgb", alpha=False, annots=True)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                images.append(img)
-
-            doc.close()
+        except Exception as e:
+            print(f"[ERROR] PDF 转换失败: {e}")
+            raise Exception(f"PDF to image conversion failed: {e}")
 
-            # 拼接图片
-            total_height = sum(img.height for img in images)
-            max_width = max(img.width for img in images)
+    @staticmethod
+    def _render_pdf(pdf_path: Path, zoom: float) -> bytes:
+        """
+        渲染 PDF（convert_pdf_to_image 的实际转换逻辑，不经过缓存）
 
-            combined = Image.new("RGB", (max_width, total_height), (255, 255, 255))
-            y_offset = 0
-            for img in images:
-                combined.paste(img, (0, y_offset))
-                y_offset += img.height
+        Args:
+            pdf_path: PDF 文件路径
+            zoom: 缩放比例
 
-            img_bytes_io = io.BytesIO()
-            combined.save(img_bytes_io, format="PNG")
-            return img_bytes_io.getvalue()
+        Returns:
+            图片字节数据或 PDF 字节数据
+        """
+        # 文件只读取一次：PyMuPDF 从内存解析，≥3 页时直接返回同一份字节
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
 
-        except Exception as e:
-            print(f"[ERROR] PDF 转换失败: {e}")
-            raise Exception(f"PDF to image conversion failed: {e}")
+        # 如果 ≥3 页，直接返回 PDF
+        if len(doc) >= 3:
+            doc.close()
+            return pdf_bytes
+
+        # <3 页时，将每页渲染为图片（两页时上下拼接）
+        # 逐页串行渲染：PyMuPDF 不支持多线程访问文档，get_pixmap 期间也不释放 GIL，
+        # 用线程池并行渲染既不安全也不会更快
+        mat = fitz.Matrix(zoom, zoom)
+        pixmaps = [
+            page.get_pixmap(matrix=mat, colorspace="rgb", alpha=False, annots=True) for page in doc
+        ]
+
+        doc.close()
+
+        # 单页（最常见的情况）直接用 PyMuPDF 编码 PNG，不经过 PIL
+        if len(pixmaps) == 1:
+            return pixmaps[0].tobytes("png")
+
+        # 拼接图片：像素直接写入一块预分配的白色画布，不再经过逐页的 PIL 图像
+        total_height = sum(pix.height for pix in pixmaps)
+        max_width = max(pix.width for pix in pixmaps)
+        row_bytes = max_width * 3
+
+        canvas = bytearray(b"\xff") * (row_bytes * total_height)
+        offset = 0
+        for pix in pixmaps:
+            samples = pix.samples_mv
+            if pix.stride == row_bytes:
+                # 与画布等宽：整页一次拷贝
+                canvas[offset : offset + len(samples)] = samples
+                offset += len(samples)
+            else:
+                # 较窄的页面逐行拷贝，右侧保留白色背景
+                width_bytes = pix.width * 3
+                for start in range(0, pix.stride * pix.height, pix.stride):
+                    canvas[offset : offset + width_bytes] = samples[start : start + width_bytes]
+                    offset += row_bytes
+
+        combined = Image.frombuffer("RGB", (max_width, total_height), canvas, "raw", "RGB", 0, 1)
+        img_bytes_io = io.BytesIO()
+        # 航图以线条和文字为主，低压缩级别编码快得多，体积增长有限
+        combined.save(img_bytes_io, format="PNG", compress_level=1)
+        return img_bytes_io.getvalue()
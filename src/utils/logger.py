@@ -2,17 +2,62 @@
 日志模块 - 统一日志管理
 """
 
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """使用大缓冲区写文件的轮转处理器，由 _BatchingQueueListener 在队列空闲时统一刷新"""
+
+    BUFFER_SIZE = 64 * 1024
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def flush(self):
+        # 不在每条记录后刷新，多条日志合并为一次 write 系统调用
+        pass
+
+    def flush_buffer(self):
+        """把缓冲区中的日志写入文件"""
+        with self.lock:
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+
+
+class _BatchingQueueListener(QueueListener):
+    """后台线程写日志，队列清空时才刷新文件缓冲区"""
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            self._flush_handlers()
+
+    def stop(self):
+        super().stop()
+        self._flush_handlers()
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            if isinstance(handler, _BufferedRotatingFileHandler):
+                handler.flush_buffer()
+
+
 class Logger:
     """日志管理器"""
 
-    _loggers = {}
+    _listener = None
 
     @staticmethod
     def setup(log_dir: str = "logs", level: int = logging.DEBUG):
@@ -35,9 +80,10 @@ class Logger:
 
         # 清除已有的处理器
         root_logger.handlers.clear()
+        Logger._stop_listener()
 
         # 文件处理器（支持轮转，最大 10MB，保留 5 个备份）
-        file_handler = RotatingFileHandler(
+        file_handler = _BufferedRotatingFileHandler(
             log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
         )
         file_handler.setLevel(level)
@@ -54,14 +100,31 @@ class Logger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        # 实际的文件/控制台写入交给后台线程，调用方只需把记录放入队列
+        log_queue = queue.Queue(-1)
+        Logger._listener = _BatchingQueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        Logger._listener.start()
+        # 退出时写完队列中剩余的日志（重复 setup 时只保留一次注册）
+        atexit.unregister(Logger._stop_listener)
+        atexit.register(Logger._stop_listener)
+
+        root_logger.addHandler(QueueHandler(log_queue))
 
         logging.info("=" * 60)
         logging.info("EAIP Viewer 启动")
         logging.info(f"日志文件: {log_file}")
         logging.info("=" * 60)
 
+    @staticmethod
+    def _stop_listener():
+        """停止后台日志线程，并写完队列中剩余的日志"""
+        listener = Logger._listener
+        if listener is not None:
+            Logger._listener = None
+            listener.stop()
+
     @staticmethod
     def get_logger(name: str) -> logging.Logger:
         """
@@ -73,6 +136,5 @@ class Logger:
         Returns:
             日志记录器
         """
-        if name not in Logger._loggers:
-            Logger._loggers[name] = logging.getLogger(name)
-        return Logger._loggers[name]
+        # logging.getLogger 自身已按名称缓存日志记录器
+        return logging.getLogger(name)
@@ -1,12 +1,16 @@
 """
 Path Helper - 路径解析工具
 用于处理开发环境和打包环境中的路径差异
+
+各目录路径在进程内不会变化，获取函数的结果会被缓存，目录也只在首次获取时创建
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def get_app_root() -> Path:
     """
     获取应用程序根目录
@@ -29,6 +33,7 @@ def get_app_root() -> Path:
     return app_root
 
 
+@lru_cache(maxsize=None)
 def get_config_dir() -> Path:
     """
     获取配置目录
@@ -41,6 +46,7 @@ def get_config_dir() -> Path:
     return config_dir
 
 
+@lru_cache(maxsize=None)
 def get_data_dir() -> Path:
     """
     获取数据目录
@@ -53,6 +59,7 @@ def get_data_dir() -> Path:
     return data_dir
 
 
+@lru_cache(maxsize=None)
 def get_cache_dir() -> Path:
     """
     获取缓存目录
@@ -65,6 +72,7 @@ def get_cache_dir() -> Path:
     return cache_dir
 
 
+@lru_cache(maxsize=None)
 def get_logs_dir() -> Path:
     """
     获取日志目录
@@ -101,6 +109,7 @@ def resolve_relative_path(relative_path: str) -> Path:
     return get_app_root() / path
 
 
+@lru_cache(maxsize=None)
 def get_config_file_path() -> Path:
     """
     获取配置文件路径
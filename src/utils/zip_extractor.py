@@ -2,21 +2,184 @@
 Zip Extractor - 压缩包解压工具
 """
 
+import errno
+import mmap
+import os
 import shutil
+import struct
+import threading
+import time
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 
 from utils.logger import Logger
 
+# 本模块的日志使用 %s 延迟格式化：日志级别未启用时不会拼接字符串
 logger = Logger.get_logger("ZipExtractor")
 
+try:
+    import deflate  # libdeflate 绑定，整块解压比 zlib 快约 2 倍
+except ImportError:
+    deflate = None
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """
+    向内核提示文件的访问方式（不支持 posix_fadvise 的平台上忽略）
+
+    Args:
+        fd: 文件描述符
+        advice: os 模块中的 POSIX_FADV_* 常量名
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+
+class _ArchiveReader:
+    """
+    工作线程读取压缩包的句柄
+
+    每个线程使用自己的原始文件描述符，按中央目录缓存的偏移直接读取成员数据，
+    不必为每个线程再解析一遍中央目录；只有需要流式解压的成员（加密、过大或其他压缩方式）
+    才共用一个按需打开的 ZipFile
+    """
+
+    # 直接用 os.open 打开压缩包（Windows 需要 O_BINARY，Linux 加上 O_CLOEXEC）
+    READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+    def __init__(self, zip_path: Union[str, Path], password: Optional[str] = None):
+        self._zip_path = os.fspath(zip_path)
+        self._password = password.encode("utf-8") if password else None
+        self._local = threading.local()
+        self._fds: List[int] = []
+        self._zip_ref: Optional[zipfile.ZipFile] = None
+        self._lock = threading.Lock()
+
+    def fileno(self) -> int:
+        """获取当前线程的文件描述符（首次调用时打开）"""
+        fd = getattr(self._local, "fd", None)
+        if fd is None:
+            fd = os.open(self._zip_path, self.READ_FLAGS)
+            # 成员按偏移顺序读取，提示内核加大预读
+            _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+            self._local.fd = fd
+            with self._lock:
+                self._fds.append(fd)
+        return fd
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """
+        从指定偏移读取数据（不依赖、也不改变共享的文件位置）
+
+        Args:
+            offset: 起始偏移
+            size: 读取的字节数
+
+        Returns:
+            读取的数据
+
+        Raises:
+            zipfile.BadZipFile: 压缩包在该位置数据不足
+        """
+        fd = self.fileno()
+        if hasattr(os, "pread"):
+            data = os.pread(fd, size, offset)
+        else:
+            # Windows 没有 pread；描述符每个线程独立，seek 后读取不会互相干扰
+            os.lseek(fd, offset, os.SEEK_SET)
+            data = os.read(fd, size)
+        if len(data) != size:
+            raise zipfile.BadZipFile("压缩包数据不完整")
+        return data
+
+    @contextmanager
+    def open_member(self, zinfo: zipfile.ZipInfo) -> Iterator[zipfile.ZipExtFile]:
+        """
+        以流的方式打开成员（所有线程共用一个 ZipFile，首次调用时打开）
+
+        Args:
+            zinfo: 成员信息
+
+        Yields:
+            成员的只读流
+        """
+        # ZipFile 的读取本身有锁保护，但打开和关闭成员时的引用计数没有，由这里串行化
+        with self._lock:
+            if self._zip_ref is None:
+                self._zip_ref = zipfile.ZipFile(self._zip_path, "r")
+                if self._password:
+                    self._zip_ref.setpassword(self._password)
+            src = self._zip_ref.open(zinfo)
+        try:
+            yield src
+        finally:
+            with self._lock:
+                src.close()
+
+    def close(self, drop_cache: bool = False) -> None:
+        """
+        关闭所有线程打开的描述符和共用的 ZipFile
+
+        Args:
+            drop_cache: 是否让内核释放压缩包占用的页缓存（整个压缩包已读完时使用）
+        """
+        with self._lock:
+            if drop_cache and self._fds:
+                _fadvise(self._fds[0], "POSIX_FADV_DONTNEED")
+            for fd in self._fds:
+                os.close(fd)
+            self._fds.clear()
+            if self._zip_ref is not None:
+                self._zip_ref.close()
+                self._zip_ref = None
+
 
 class ZipExtractor:
     """ZIP 文件解压器"""
 
-    def __init__(self):
-        pass
+    # 写文件的缓冲区大小：小文件 64 KiB，≥1 MiB 的大文件使用 1 MiB
+    SMALL_BUFFER_SIZE = 64 * 1024
+    LARGE_BUFFER_SIZE = 1024 * 1024
+    # 有 libdeflate 时所有工作线程整块解压占用的内存合计上限，按线程数平分到每个成员
+    # （更大的成员仍流式解压，避免占用过多内存）
+    IN_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+    # 两次进度回调之间的最小间隔（秒）
+    PROGRESS_INTERVAL = 0.05
+    # 直接用 os.open 打开目标文件（Windows 需要 O_BINARY，Linux 加上 O_CLOEXEC）
+    WRITE_FLAGS = (
+        os.O_WRONLY
+        | os.O_CREAT
+        | os.O_TRUNC
+        | getattr(os, "O_BINARY", 0)
+        | getattr(os, "O_CLOEXEC", 0)
+    )
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        初始化解压器
+
+        Args:
+            max_workers: 并行解压的线程数（默认使用 CPU 线程数）
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 4)
+        # 整块解压的成员大小上限：各线程同时整块解压时合计不超过 IN_MEMORY_MAX_SIZE；
+        # 只有 zlib 时仅用于小文件
+        if deflate is not None:
+            self._in_memory_limit = max(
+                self.SMALL_BUFFER_SIZE, self.IN_MEMORY_MAX_SIZE // self.max_workers
+            )
+        else:
+            self._in_memory_limit = self.SMALL_BUFFER_SIZE
+        # 中央目录缓存：只保留最近一个压缩包的 (绝对路径, (mtime_ns, 文件大小), ZipInfo 列表)，
+        # 几万个条目的 ZipInfo 占用不小，不为处理过的每个压缩包都保留一份
+        self._cache: Optional[Tuple[str, Tuple[int, int], List[zipfile.ZipInfo]]] = None
 
     def extract(
         self,
@@ -24,6 +187,7 @@ class ZipExtractor:
         extract_to: str,
         password: Optional[str] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        sync: bool = False,
     ) -> bool:
         """
         解压 ZIP 文件
@@ -33,6 +197,8 @@ class ZipExtractor:
             extract_to: 解压目标目录
             password: 密码（可选）
             progress_callback: 进度回调函数 (当前文件索引, 总文件数)
+            sync: 解压完成后是否调用一次 os.sync() 把数据落盘（默认不调用，
+                由系统在后台写回；需要断电安全时再开启，会多等待一次全盘刷新）
 
         Returns:
             是否成功
@@ -42,61 +208,99 @@ class ZipExtractor:
             zipfile.BadZipFile: 不是有效的 ZIP 文件
             OSError: 磁盘空间不足或其他 IO 错误
         """
-        logger.debug(f"开始解压: {zip_path} -> {extract_to}")
+        logger.debug("开始解压: %s -> %s", zip_path, extract_to)
 
         zip_file_path = Path(zip_path)
         if not zip_file_path.exists():
-            logger.error(f"ZIP 文件不存在: {zip_path}")
+            logger.error("ZIP 文件不存在: %s", zip_path)
             raise FileNotFoundError(f"ZIP 文件不存在: {zip_path}")
 
         extract_path = Path(extract_to)
+        # 目标目录不存在时先解压到同级的 .partial 目录，全部成功后再一次改名，
+        # 失败时也只需清理这个临时目录；目标目录已存在时直接原地解压（未变化的文件会被跳过）
+        if extract_path.exists():
+            work_path = extract_path
+        else:
+            work_path = extract_path.with_name(extract_path.name + ".partial")
+            # 上次解压被中断（如进程被结束）时可能留下 .partial，其中其他压缩包的文件
+            # 不能混入本次结果，先整个删除
+            shutil.rmtree(work_path, ignore_errors=True)
 
         try:
             # 创建解压目录
-            extract_path.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"创建解压目录: {extract_path}")
-
-            with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-                if password:
-                    zip_ref.setpassword(password.encode("utf-8"))
-
-                # 获取文件列表
-                file_list = zip_ref.namelist()
-                total_files = len(file_list)
-                logger.info(f"ZIP 文件包含 {total_files} 个文件")
-
-                # 逐个解压文件并报告进度
-                for index, file_name in enumerate(file_list):
-                    zip_ref.extract(file_name, extract_path)
-
-                    # 调用进度回调
-                    if progress_callback and index % max(1, total_files // 100) == 0:
-                        progress_callback(index + 1, total_files)
-
-                # 确保最后报告100%
-                if progress_callback:
-                    progress_callback(total_files, total_files)
-
-            logger.info(f"解压成功: {extract_path}")
+            work_path.mkdir(parents=True, exist_ok=True)
+            logger.debug("创建解压目录: %s", work_path)
+
+            # 获取文件列表（infolist 直接复用 ZipInfo，不必再按名称查找）
+            infos = self._get_infos(zip_file_path)
+
+            # 先串行创建所有目录，避免多个线程同时创建同一目录
+            # 循环内用到的方法提前绑定为局部变量，条目很多时省去每次的属性查找
+            # 目标路径用字符串拼接，不为每个条目创建 Path 对象
+            base = os.path.abspath(work_path)
+            members = []
+            directories = set()
+            member_path = self._member_path
+            dirname = os.path.dirname
+            add_directory = directories.add
+            add_member = members.append
+            for zinfo in infos:
+                target = member_path(base, zinfo.filename)
+                if zinfo.is_dir():
+                    add_directory(target)
+                else:
+                    add_directory(dirname(target))
+                    add_member((zinfo, target))
+            # 每个目录只创建一次；按深度从浅到深创建，上级目录已存在，每次只需一个 mkdir 调用
+            directories.discard(base)
+            for directory in sorted(directories, key=lambda path: path.count(os.sep)):
+                os.makedirs(directory, exist_ok=True)
+
+            # 按本地文件头在压缩包中的偏移排序，读取压缩包时尽量顺序访问磁盘
+            members.sort(key=lambda member: member[0].header_offset)
+
+            total_files = len(members)
+            logger.info("ZIP 文件包含 %d 个文件", total_files)
+
+            # 并行解压：每个工作线程用自己的文件描述符按偏移读取成员数据，
+            # 读取、解压和文件写入期间都会释放 GIL。
+            # 注意不要对单个文件 fsync：成千上万个小文件逐个刷盘会让解压慢一个数量级，
+            # 需要持久化时由 sync 参数在最后统一刷新一次
+            reader = _ArchiveReader(zip_file_path, password)
+            try:
+                self._extract_all(reader, members, progress_callback)
+            finally:
+                # 压缩包已读完，让内核释放它占用的页缓存，把内存留给解压出的文件
+                reader.close(drop_cache=True)
+
+            if sync and hasattr(os, "sync"):
+                os.sync()
+
+            if work_path != extract_path:
+                os.rename(work_path, extract_path)
+
+            # 确保最后报告100%
+            if progress_callback:
+                progress_callback(total_files, total_files)
+
+            logger.info("解压成功: %s", extract_path)
             return True
 
         except zipfile.BadZipFile as e:
-            logger.error(f"无效的 ZIP 文件: {e}")
+            logger.error("无效的 ZIP 文件: %s", e)
+
+            # 清理本次写入的目录
+            self._cleanup(work_path)
+
             raise zipfile.BadZipFile(f"无效的 ZIP 文件: {str(e)}")
 
         except OSError as e:
             # 捕获磁盘空间不足等错误
             error_msg = str(e)
-            logger.error(f"解压失败 (OSError): {error_msg}", exc_info=True)
+            logger.error("解压失败 (OSError): %s", error_msg, exc_info=True)
 
-            # 清理已解压的文件
-            if extract_path.exists():
-                logger.warning(f"清理不完整的解压目录: {extract_path}")
-                try:
-                    shutil.rmtree(extract_path)
-                    logger.info("清理完成")
-                except Exception as cleanup_error:
-                    logger.error(f"清理失败: {cleanup_error}")
+            # 清理本次写入的目录
+            self._cleanup(work_path)
 
             # 检查是否是磁盘空间不足
             if "No space left on device" in error_msg or e.errno == 28:
@@ -105,19 +309,432 @@ class ZipExtractor:
                 raise OSError(f"解压失败: {error_msg}") from e
 
         except Exception as e:
-            logger.error(f"解压失败: {e}", exc_info=True)
+            logger.error("解压失败: %s", e, exc_info=True)
 
-            # 清理已解压的文件
-            if extract_path.exists():
-                logger.warning(f"清理不完整的解压目录: {extract_path}")
-                try:
-                    shutil.rmtree(extract_path)
-                    logger.info("清理完成")
-                except Exception as cleanup_error:
-                    logger.error(f"清理失败: {cleanup_error}")
+            # 清理本次写入的目录
+            self._cleanup(work_path)
 
             raise Exception(f"解压失败: {str(e)}") from e
 
+    def _extract_all(
+        self,
+        reader: _ArchiveReader,
+        members: List[Tuple[zipfile.ZipInfo, str]],
+        progress_callback: Optional[Callable[[int, int], None]],
+    ) -> None:
+        """
+        在线程池中并行解压所有成员，并在调用线程中定时报告进度
+
+        Args:
+            reader: 压缩包读取句柄
+            members: (成员信息, 解压路径) 列表
+            progress_callback: 进度回调函数 (已完成文件数, 总文件数)
+
+        Raises:
+            Exception: 任一成员解压失败时抛出其异常（尚未开始的成员不再解压）
+        """
+        total_files = len(members)
+        completed = 0
+        lock = threading.Lock()
+        finished = threading.Event()
+        errors = []
+        if not total_files:
+            finished.set()
+
+        extract_member = self._extract_member
+
+        def run(member):
+            nonlocal completed
+            try:
+                extract_member(reader, *member)
+            except BaseException as e:
+                errors.append(e)
+                finished.set()
+                raise
+            with lock:
+                completed += 1
+                if completed == total_files:
+                    finished.set()
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, total_files)))
+        try:
+            for member in members:
+                executor.submit(run, member)
+
+            # 工作线程只递增计数；进度由调用线程每 PROGRESS_INTERVAL 报告一次，
+            # 不受某个大文件解压耗时的阻塞，也不会让工作线程等待跨线程的 Qt 信号
+            reported = 0
+            while not finished.wait(self.PROGRESS_INTERVAL):
+                if progress_callback and completed != reported:
+                    reported = completed
+                    progress_callback(reported, total_files)
+        finally:
+            # 出错时取消尚未开始的任务
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _cleanup(path: Path) -> None:
+        """
+        删除解压失败时留下的目录
+
+        Args:
+            path: 要删除的目录
+        """
+        if path.exists():
+            logger.warning("清理不完整的解压目录: %s", path)
+            try:
+                shutil.rmtree(path)
+                logger.info("清理完成")
+            except Exception as cleanup_error:
+                logger.error("清理失败: %s", cleanup_error)
+
+    def _get_infos(self, zip_path) -> List[zipfile.ZipInfo]:
+        """
+        获取 ZIP 的成员列表（缓存最近一个压缩包，文件未变化时不再重复解析中央目录）
+
+        Args:
+            zip_path: ZIP 文件路径
+
+        Returns:
+            ZipInfo 列表
+
+        Raises:
+            OSError: 文件无法访问
+            zipfile.BadZipFile: 不是有效的 ZIP 文件
+        """
+        path = os.path.abspath(zip_path)
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._cache
+        if cached is not None and cached[0] == path and cached[1] == signature:
+            return cached[2]
+
+        with zipfile.ZipFile(path, "r") as zip_ref:
+            infos = zip_ref.infolist()
+        self._cache = (path, signature, infos)
+        return infos
+
+    @staticmethod
+    def _member_path(base: str, filename: str) -> str:
+        """
+        计算 ZIP 成员的解压路径（与 ZipFile.extract 相同：去掉盘符、绝对路径和 ".."，
+        Windows 上还会替换文件名中的非法字符）
+
+        Args:
+            base: 解压目标目录（规范化的绝对路径）
+            filename: ZIP 内的文件名
+
+        Returns:
+            解压后的文件路径
+
+        Raises:
+            zipfile.BadZipFile: 文件名指向解压目录之外
+        """
+        sep = os.sep
+        arcname = filename.replace("/", sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        parts = [part for part in arcname.split(sep) if part not in ("", os.curdir, os.pardir)]
+        arcname = sep.join(parts)
+        if sep == "\\":
+            # 与 ZipFile.extract 一致：替换 :<>|"?* 等字符并去掉末尾的点和空格，
+            # 否则 "a:b" 会写入 NTFS 备用数据流，其他非法字符会导致写入失败
+            arcname = zipfile.ZipFile._sanitize_windows_name(arcname, sep)
+        if not arcname:
+            return base
+
+        prefix = base if base.endswith(sep) else base + sep
+        target = prefix + arcname
+        # 防止 zip-slip：拼接结果必须仍在解压目录内
+        if os.path.commonpath((base, target)) != base:
+            raise zipfile.BadZipFile(f"非法的文件路径: {filename}")
+        return target
+
+    @staticmethod
+    def _data_offset(reader: _ArchiveReader, zinfo: zipfile.ZipInfo) -> int:
+        """
+        解析本地文件头，计算成员数据在压缩包中的起始偏移
+
+        Args:
+            reader: 压缩包读取句柄
+            zinfo: 成员信息
+
+        Returns:
+            数据起始偏移
+        """
+        header = struct.unpack(
+            zipfile.structFileHeader, reader.read_at(zinfo.header_offset, zipfile.sizeFileHeader)
+        )
+        if header[0] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"本地文件头损坏: {zinfo.filename}")
+
+        # 跳过本地文件头中的文件名和扩展字段
+        return (
+            zinfo.header_offset
+            + zipfile.sizeFileHeader
+            + header[zipfile._FH_FILENAME_LENGTH]
+            + header[zipfile._FH_EXTRA_FIELD_LENGTH]
+        )
+
+    @classmethod
+    def _read_raw(cls, reader: _ArchiveReader, zinfo: zipfile.ZipInfo) -> bytes:
+        """
+        读取成员的原始（压缩后的）数据
+
+        Args:
+            reader: 压缩包读取句柄
+            zinfo: 成员信息
+
+        Returns:
+            压缩数据
+        """
+        return reader.read_at(cls._data_offset(reader, zinfo), zinfo.compress_size)
+
+    @staticmethod
+    def _inflate(raw: bytes, zinfo: zipfile.ZipInfo) -> Union[bytes, bytearray]:
+        """
+        解压 DEFLATE 数据（优先使用 libdeflate）
+
+        Args:
+            raw: 压缩数据
+            zinfo: 成员信息（提供解压后的大小）
+
+        Returns:
+            解压后的数据（libdeflate 返回 bytearray，zlib 返回 bytes）
+        """
+        if deflate is not None:
+            try:
+                return deflate.deflate_decompress(raw, zinfo.file_size)
+            except deflate.DeflateError as e:
+                raise zipfile.BadZipFile(f"解压数据损坏: {zinfo.filename}") from e
+        return zlib.decompress(raw, -zlib.MAX_WBITS, max(1, zinfo.file_size))
+
+    def _extract_member(self, reader: _ArchiveReader, zinfo: zipfile.ZipInfo, target: str):
+        """
+        解压单个文件（在线程池中执行，目标目录需已创建）
+
+        Args:
+            reader: 压缩包读取句柄
+            zinfo: 成员信息
+            target: 解压后的文件路径
+        """
+        # 重复导入同一个压缩包时，内容未变的文件直接跳过
+        if self._is_up_to_date(target, zinfo):
+            return
+
+        if (
+            zinfo.compress_type == zipfile.ZIP_STORED
+            and not zinfo.flag_bits & 0x1  # 未加密
+            and zinfo.file_size
+            and hasattr(os, "copy_file_range")
+            and self._copy_stored(reader, zinfo, target)
+        ):
+            self._restore_mtime(target, zinfo)
+            return
+
+        if (
+            zinfo.compress_type in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED)
+            and not zinfo.flag_bits & 0x1  # 未加密
+            and zinfo.file_size < self._in_memory_limit
+        ):
+            # 读取原始数据后一次性解压，省去 ZipExtFile 的流式解压和逐块 CRC 计算；
+            # 中央目录给出了解压后的大小，正好满足 libdeflate 整块解压的要求
+            data = self._read_raw(reader, zinfo)
+            if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+                data = self._inflate(data, zinfo)
+            if len(data) != zinfo.file_size or zlib.crc32(data) != zinfo.CRC:
+                raise zipfile.BadZipFile(f"CRC 校验失败: {zinfo.filename}")
+            fd = self._open_target(target, zinfo.file_size)
+            try:
+                self._write_all(fd, data)
+            finally:
+                os.close(fd)
+            self._restore_mtime(target, zinfo)
+            return
+
+        if zinfo.file_size >= self.LARGE_BUFFER_SIZE:
+            buffer_size = self.LARGE_BUFFER_SIZE
+        else:
+            buffer_size = self.SMALL_BUFFER_SIZE
+
+        fd = self._open_target(target, zinfo.file_size)
+        try:
+            with reader.open_member(zinfo) as src:
+                read = src.read
+                while True:
+                    chunk = read(buffer_size)
+                    if not chunk:
+                        break
+                    self._write_all(fd, chunk)
+        finally:
+            os.close(fd)
+
+        self._restore_mtime(target, zinfo)
+
+    def _copy_stored(self, reader: _ArchiveReader, zinfo: zipfile.ZipInfo, target: str) -> bool:
+        """
+        用 os.copy_file_range 在内核中直接复制未压缩（STORED）成员的数据
+
+        Args:
+            reader: 压缩包读取句柄
+            zinfo: 成员信息
+            target: 解压后的文件路径
+
+        Returns:
+            是否已复制；文件系统不支持时返回 False，由调用方改用普通方式解压
+        """
+        offset = self._data_offset(reader, zinfo)
+        src_fd = reader.fileno()
+        fd = self._open_target(target, zinfo.file_size)
+        try:
+            remaining = zinfo.file_size
+            while remaining:
+                copied = os.copy_file_range(src_fd, fd, remaining, offset)
+                if not copied:
+                    raise zipfile.BadZipFile(f"文件数据不完整: {zinfo.filename}")
+                offset += copied
+                remaining -= copied
+        except OSError as e:
+            # 跨文件系统或内核/文件系统不支持时回退
+            if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                return False
+            raise
+        finally:
+            os.close(fd)
+
+        # 数据没有经过 ZipExtFile，需要自行校验 CRC（刚写入的数据仍在页缓存中）
+        if not self._is_up_to_date(target, zinfo):
+            raise zipfile.BadZipFile(f"CRC 校验失败: {zinfo.filename}")
+        return True
+
+    def _is_up_to_date(self, target: str, zinfo: zipfile.ZipInfo) -> bool:
+        """
+        检查目标文件是否已与 ZIP 成员一致（大小相同且 CRC-32 相同）
+
+        Args:
+            target: 解压后的文件路径
+            zinfo: 成员信息
+
+        Returns:
+            是否可以跳过解压
+        """
+        try:
+            size = os.stat(target).st_size
+            if size != zinfo.file_size:
+                return False
+            if size == 0:
+                # 空文件无法 mmap
+                return zinfo.CRC == 0
+            # 计算 CRC-32 比重新解压和写入快得多；
+            # 映射整个文件后一次调用 zlib.crc32，不必在 Python 中逐块读取
+            with open(target, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                crc = zlib.crc32(mm)
+        except (OSError, ValueError):
+            # 无法读取或映射时按需要重新解压处理
+            return False
+        return crc == zinfo.CRC
+
+    def _open_target(self, target: str, size: int) -> int:
+        """
+        以写方式打开目标文件，大文件按解压后的大小预先分配磁盘空间
+
+        Args:
+            target: 解压后的文件路径
+            size: 解压后的文件大小
+
+        Returns:
+            文件描述符
+        """
+        fd = os.open(target, self.WRITE_FLAGS, 0o644)
+        # 中央目录给出了最终大小，一次分配连续空间，避免边写边扩展产生碎片；
+        # 磁盘空间不足时也能在写入前就失败
+        if size >= self.LARGE_BUFFER_SIZE and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    os.close(fd)
+                    raise
+                # 文件系统不支持预分配时照常写入
+        return fd
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        """
+        把数据完整写入文件描述符（直接 os.write，省去每个文件创建 FileIO/BufferedWriter 的开销）
+
+        Args:
+            fd: 以写方式打开的文件描述符
+            data: 要写入的数据
+        """
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    @staticmethod
+    def _restore_mtime(target: str, zinfo: zipfile.ZipInfo) -> None:
+        """保留压缩包中记录的修改时间"""
+        mtime = time.mktime(zinfo.date_time + (0, 0, -1))
+        os.utime(target, (mtime, mtime))
+
+    def extract_to_bytes(self, zip_path: str, name: str, password: Optional[str] = None) -> bytes:
+        """
+        将 ZIP 中的单个文件解压到内存（如用于预览 PDF）
+
+        Args:
+            zip_path: ZIP 文件路径
+            name: ZIP 内的文件名
+            password: 密码（可选）
+
+        Returns:
+            文件内容
+
+        Raises:
+            KeyError: ZIP 中不存在该文件
+            zipfile.BadZipFile: 数据损坏
+        """
+        # 复用缓存的中央目录；与 ZipFile.getinfo 一致，同名成员以最后一个为准
+        zinfo = next(
+            (zinfo for zinfo in reversed(self._get_infos(zip_path)) if zinfo.filename == name),
+            None,
+        )
+        if zinfo is None:
+            raise KeyError(f"There is no item named {name!r} in the archive")
+
+        reader = _ArchiveReader(zip_path, password)
+        try:
+            if (
+                zinfo.compress_type == zipfile.ZIP_DEFLATED
+                and not zinfo.flag_bits & 0x1  # 未加密
+                and zinfo.file_size < self._in_memory_limit
+            ):
+                data = self._inflate(self._read_raw(reader, zinfo), zinfo)
+                if len(data) != zinfo.file_size or zlib.crc32(data) != zinfo.CRC:
+                    raise zipfile.BadZipFile(f"CRC 校验失败: {zinfo.filename}")
+                # libdeflate 返回可变的 bytearray，统一转换为 bytes（已是 bytes 时不复制）
+                return bytes(data)
+
+            # 按中央目录记录的大小预分配缓冲区，用 readinto 直接写入，避免反复扩容拷贝
+            out = bytearray(zinfo.file_size)
+            view = memoryview(out)
+            pos = 0
+            with reader.open_member(zinfo) as src:
+                while pos < zinfo.file_size:
+                    count = src.readinto(view[pos : pos + self.LARGE_BUFFER_SIZE])
+                    if not count:
+                        break
+                    pos += count
+            if pos != zinfo.file_size:
+                raise zipfile.BadZipFile(f"文件大小不符: {zinfo.filename}")
+            return bytes(out)
+        finally:
+            reader.close()
+
     def list_contents(self, zip_path: str) -> list:
         """
         列出 ZIP 文件内容
@@ -129,8 +746,7 @@ class ZipExtractor:
             文件列表
         """
         try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                return zip_ref.namelist()
+            return [zinfo.filename for zinfo in self._get_infos(zip_path)]
         except Exception as e:
             print(f"读取 ZIP 文件失败: {e}")
             return []
@@ -145,10 +761,5 @@ class ZipExtractor:
         Returns:
             是否有效
         """
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                # 尝试读取文件列表
-                zip_ref.namelist()
-                return True
-        except:
-            return False
+        # 只检查文件末尾的中央目录结束记录，不解析整个中央目录
+        return zipfile.is_zipfile(zip_path)
@@ -0,0 +1,116 @@
+"""
+航图处理测试
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from utils.chart_processor import ChartProcessor
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """以临时目录为数据根目录的处理器"""
+    return ChartProcessor(tmp_path)
+
+
+class TestRename:
+    """测试航图重命名"""
+
+    def test_rename_noreplace(self, tmp_path):
+        """目标已存在时抛出 FileExistsError，两个文件都保持不变"""
+        src = tmp_path / "src.pdf"
+        dst = tmp_path / "dst.pdf"
+        src.write_bytes(b"src")
+        dst.write_bytes(b"dst")
+
+        with pytest.raises(FileExistsError):
+            ChartProcessor._rename_noreplace(str(src), str(dst))
+
+        assert src.read_bytes() == b"src"
+        assert dst.read_bytes() == b"dst"
+
+    def test_duplicate_targets_skipped(self, processor, tmp_path):
+        """清理后同名的航图只重命名第一个，不会互相覆盖"""
+        source = tmp_path / "Data" / "EAIP" / "Terminal" / "ZBAA"
+        source.mkdir(parents=True)
+        (source / "1.pdf").write_bytes(b"first")
+        (source / "2.pdf").write_bytes(b"second")
+
+        processor.ad_json_path.parent.mkdir(parents=True)
+        processor.ad_json_path.write_text(
+            json.dumps(
+                [
+                    {"name": "ZBAA-7A:SID", "pdfPath": "/Data/EAIP/Terminal/ZBAA/1.pdf"},
+                    {"name": "ZBAA-7A-SID", "pdfPath": "/Data/EAIP/Terminal/ZBAA/2.pdf"},
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+        processor._rename_airport_charts()
+
+        assert (source / "ZBAA-7A-SID.pdf").read_bytes() == b"first"
+        assert (source / "2.pdf").read_bytes() == b"second"
+
+
+class TestCachedIndex:
+    """测试机场索引的增量复用"""
+
+    @pytest.fixture
+    def airport(self, tmp_path):
+        """包含根目录航图和分类子文件夹的机场，索引晚于全部内容"""
+        airport = tmp_path / "ZBAA"
+        (airport / "SID").mkdir(parents=True)
+        (airport / "ZBAA-1A.pdf").write_bytes(b"%PDF")
+        (airport / "SID" / "ZBAA-7A-SID.pdf").write_bytes(b"%PDF")
+        (airport / "index.json").write_text(json.dumps([{"id": 1}, {"id": 2}]))
+
+        # 把已有内容的修改时间统一调早，之后的任何改动都晚于索引
+        old = time.time() - 100
+        for path in [airport / "SID" / "ZBAA-7A-SID.pdf", airport / "SID", airport / "ZBAA-1A.pdf"]:
+            os.utime(path, (old, old))
+        os.utime(airport, (old, old))
+        os.utime(airport / "index.json", (old + 1, old + 1))
+        return airport
+
+    def test_unchanged_airport_skipped(self, processor, airport, monkeypatch):
+        """目录未变化时直接返回索引中的数量，不再合并和生成"""
+        assert processor._cached_index_count(airport) == 2
+
+        def fail(*args):
+            raise AssertionError("不应重新合并")
+
+        monkeypatch.setattr(processor, "merge_special_charts", fail)
+        assert processor._generate_airport_index(airport) == ("ZBAA", 2)
+
+    @pytest.mark.parametrize("folder", ["", "SID"], ids=["root", "subfolder"])
+    def test_new_file_forces_regeneration(self, processor, airport, folder):
+        """机场目录或子文件夹中新增文件时索引失效"""
+        (airport / folder / "new.pdf").write_bytes(b"%PDF")
+        assert processor._cached_index_count(airport) is None
+
+    @pytest.mark.parametrize(
+        "name", ["ZBAA-1A.pdf", "SID/ZBAA-7A-SID.pdf"], ids=["root", "subfolder"]
+    )
+    def test_renamed_file_forces_regeneration(self, processor, airport, name):
+        """重命名文件（内容和修改时间不变）同样使索引失效"""
+        path = airport / name
+        path.rename(path.with_name("renamed.pdf"))
+        assert processor._cached_index_count(airport) is None
+
+    def test_missing_index(self, processor, airport):
+        """没有 index.json 时需要生成"""
+        (airport / "index.json").unlink()
+        assert processor._cached_index_count(airport) is None
+
+    def test_corrupt_index(self, processor, airport):
+        """index.json 损坏时需要重新生成"""
+        index_file = airport / "index.json"
+        stat = index_file.stat()
+        index_file.write_text('[{"id": 1}, {"id"')
+        os.utime(index_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert processor._cached_index_count(airport) is None
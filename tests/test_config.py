@@ -0,0 +1,107 @@
+"""
+配置管理测试
+"""
+
+import json
+
+import pytest
+
+from utils import config as config_module
+from utils.config import Config
+
+
+@pytest.fixture
+def shutdown_hooks(monkeypatch):
+    """记录 Config 注册的退出回调，而不是真正注册到 atexit"""
+    hooks = []
+    monkeypatch.setattr(config_module.atexit, "register", hooks.append)
+    return hooks
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    return tmp_path / "settings.json"
+
+
+@pytest.fixture
+def config(config_file, shutdown_hooks):
+    """使用临时配置文件的 Config"""
+    return Config(str(config_file))
+
+
+def _read(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class TestGetCache:
+    """测试 get() 结果缓存"""
+
+    def test_invalidated_by_set(self, config):
+        """set 之后 get 返回新值，包括此前缓存为"不存在"的配置项"""
+        assert config.get("theme.mode") == "light"
+        assert config.get("custom.key", "missing") == "missing"
+
+        config.set("theme.mode", "dark")
+        config.set("custom.key", 1)
+
+        assert config.get("theme.mode") == "dark"
+        assert config.get("custom.key", "missing") == 1
+
+    def test_invalidated_by_reset(self, config):
+        """reset 之后 get 返回默认值"""
+        config.set("max_pins", 3)
+        assert config.get("max_pins") == 3
+
+        config.reset()
+        assert config.get("max_pins") == 10
+
+
+class TestSet:
+    """测试 set() 的变化检测"""
+
+    def test_unchanged_value(self, config):
+        """值未变化时返回 False，且不触发 configChanged"""
+        changes = []
+        config.configChanged.connect(lambda key, value: changes.append((key, value)))
+
+        assert config.set("language", "zh_CN") is False
+        assert changes == []
+
+        assert config.set("language", "en_US") is True
+        assert changes == [("language", "en_US")]
+
+    def test_property_setter_skips_save(self, config):
+        """QML 属性设置为相同值时不安排保存"""
+        config.language = config.language
+        assert not config._save_pending
+
+
+class TestSave:
+    """测试配置保存"""
+
+    def test_flush_pending_save(self, config, config_file):
+        """_flush_save 立即写入延迟保存的修改"""
+        config.themeMode = "dark"
+        assert config._save_pending
+        assert _read(config_file)["theme"]["mode"] == "light"
+
+        config._flush_save()
+
+        assert not config._save_pending
+        assert _read(config_file)["theme"]["mode"] == "dark"
+
+    def test_flush_at_shutdown(self, config, config_file, shutdown_hooks):
+        """退出时写入尚未保存的修改"""
+        config.maxPins = 5
+        for hook in shutdown_hooks:
+            hook()
+        assert _read(config_file)["max_pins"] == 5
+
+    def test_atomic_replace(self, config, config_file):
+        """保存后配置文件是完整的 JSON，不残留临时文件"""
+        config.set("language", "en_US")
+        config.save()
+
+        assert _read(config_file)["language"] == "en_US"
+        assert not config_file.with_name("settings.json.tmp").exists()
+        assert Config(str(config_file)).get("language") == "en_US"
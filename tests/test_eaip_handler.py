@@ -0,0 +1,110 @@
+"""
+EAIP 数据查询测试
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.eaip_handler import EaipHandler
+
+
+def _chart(chart_id: int, code: str, sort: str) -> dict:
+    return {
+        "id": chart_id,
+        "code": code,
+        "name": f"ZBAA-{code}",
+        "path": f"{sort}/ZBAA-{code}.pdf",
+        "sort": sort,
+    }
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """以临时目录为数据根目录的处理器"""
+    return EaipHandler(tmp_path, airac_period="2505")
+
+
+@pytest.fixture
+def index_file(tmp_path):
+    """ZBAA 的 index.json"""
+    airport = tmp_path / "2505" / "Terminal" / "ZBAA"
+    airport.mkdir(parents=True)
+    path = airport / "index.json"
+    path.write_text(json.dumps([_chart(1, "2A", "ADC"), _chart(2, "7A", "SID")]))
+    return path
+
+
+class TestChartList:
+    """测试航图列表查询"""
+
+    def test_filter_returns_copies(self, handler, index_file):
+        """只返回筛选后的条目，改写结果不影响缓存"""
+        result = handler.get_chart_list("ZBAA", search_type="SID")
+        assert [chart["code"] for chart in result] == ["7A"]
+
+        result[0]["path"] = "changed"
+        assert handler.get_chart_list("ZBAA", code="7a")[0]["path"] == "SID/ZBAA-7A.pdf"
+
+    def test_cache_invalidated_by_mtime(self, handler, index_file):
+        """index.json 的 st_mtime_ns 变化后重新读取"""
+        assert len(handler.get_chart_list("ZBAA")) == 2
+        mtime_ns = index_file.stat().st_mtime_ns
+
+        # 修改时间不变时沿用已解析的结果
+        index_file.write_text(json.dumps([_chart(3, "8B", "STAR")]))
+        os.utime(index_file, ns=(mtime_ns, mtime_ns))
+        assert len(handler.get_chart_list("ZBAA")) == 2
+
+        os.utime(index_file, ns=(mtime_ns + 1, mtime_ns + 1))
+        assert [chart["code"] for chart in handler.get_chart_list("ZBAA")] == ["8B"]
+
+
+class TestRenderCache:
+    """测试渲染结果的字节数 LRU 缓存"""
+
+    @pytest.fixture
+    def renders(self, handler, tmp_path, monkeypatch):
+        """用文件内容代替实际渲染，并记录每次渲染的文件名"""
+        calls = []
+
+        def render(pdf_path, zoom):
+            calls.append(pdf_path.stem)
+            return pdf_path.read_bytes()
+
+        monkeypatch.setattr(EaipHandler, "_render_pdf", staticmethod(render))
+        monkeypatch.setattr(handler, "RENDER_CACHE_MAX_BYTES", 100)
+        for name, size in [("a", 40), ("b", 40), ("c", 40), ("huge", 150)]:
+            (tmp_path / f"{name}.pdf").write_bytes(name[0].encode() * size)
+        return calls
+
+    def _convert(self, handler, tmp_path, name):
+        return handler.convert_pdf_to_image(tmp_path / f"{name}.pdf")
+
+    def test_evicts_least_recently_used(self, handler, tmp_path, renders):
+        """超过字节上限时淘汰最久未使用的结果"""
+        for name in ["a", "b", "a", "c"]:
+            self._convert(handler, tmp_path, name)
+
+        # 第二次读取 a 命中缓存，并使 b 成为最久未使用的条目
+        assert renders == ["a", "b", "c"]
+        assert [Path(key[0]).stem for key in handler._render_cache] == ["a", "c"]
+        assert handler._render_cache_bytes == 80
+
+        self._convert(handler, tmp_path, "b")
+        assert renders == ["a", "b", "c", "b"]
+        assert [Path(key[0]).stem for key in handler._render_cache] == ["c", "b"]
+        assert handler._render_cache_bytes == 80
+
+    def test_too_large_bypasses_cache(self, handler, tmp_path, renders):
+        """超过上限的单个结果照常返回，但不缓存也不挤掉已有条目"""
+        self._convert(handler, tmp_path, "a")
+
+        assert self._convert(handler, tmp_path, "huge") == b"h" * 150
+        assert self._convert(handler, tmp_path, "huge") == b"h" * 150
+
+        assert renders == ["a", "huge", "huge"]
+        assert [Path(key[0]).stem for key in handler._render_cache] == ["a"]
+        assert handler._render_cache_bytes == 40
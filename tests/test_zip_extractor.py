@@ -0,0 +1,331 @@
+"""
+ZIP 解压测试
+"""
+
+import errno
+import ntpath
+import os
+import struct
+import types
+import zipfile
+import zlib
+
+import pytest
+
+from utils import zip_extractor
+from utils.zip_extractor import ZipExtractor
+
+
+@pytest.fixture
+def windows_paths(monkeypatch):
+    """让 zip_extractor 按 Windows 的路径规则计算解压路径"""
+    fake_os = types.SimpleNamespace(sep="\\", curdir=".", pardir="..", path=ntpath)
+    monkeypatch.setattr(zip_extractor, "os", fake_os)
+
+
+class TestMemberPath:
+    """测试成员解压路径的计算"""
+
+    @pytest.mark.skipif(os.sep != "/", reason="仅适用于 POSIX 路径")
+    @pytest.mark.parametrize(
+        "filename, expected",
+        [
+            ("a/b.pdf", "/base/a/b.pdf"),
+            ("../../etc/passwd", "/base/etc/passwd"),
+            ("a/../../b.pdf", "/base/a/b.pdf"),
+            ("/etc/passwd", "/base/etc/passwd"),
+            ("./a/./b.pdf", "/base/a/b.pdf"),
+            ("..", "/base"),
+        ],
+    )
+    def test_posix(self, filename, expected):
+        """去掉 ".." 和绝对路径，结果始终位于解压目录内"""
+        assert ZipExtractor._member_path("/base", filename) == expected
+
+    @pytest.mark.parametrize(
+        "filename, expected",
+        [
+            ("a/b.pdf", "C:\\base\\a\\b.pdf"),
+            ("..\\..\\Windows\\win.ini", "C:\\base\\Windows\\win.ini"),
+            ("\\Windows\\win.ini", "C:\\base\\Windows\\win.ini"),
+            ("D:\\evil.pdf", "C:\\base\\evil.pdf"),
+            ("D:evil.pdf", "C:\\base\\evil.pdf"),
+            ("a:b.pdf", "C:\\base\\b.pdf"),
+            ("dir/a:b.pdf", "C:\\base\\dir\\a_b.pdf"),
+            ('x<y>|"?*.pdf', "C:\\base\\x_y_____.pdf"),
+            ("dir./name..", "C:\\base\\dir\\name"),
+        ],
+    )
+    def test_windows(self, windows_paths, filename, expected):
+        """Windows 上还会去掉盘符并替换非法字符（":" 不能写入备用数据流）"""
+        assert ZipExtractor._member_path("C:\\base", filename) == expected
+
+
+def _zip_crypto_encrypt(data: bytes, password: bytes, crc: int) -> bytes:
+    """用传统 PKWARE 加密（ZipCrypto）加密数据，返回 12 字节加密头 + 密文"""
+    keys = [0x12345678, 0x23456789, 0x34567890]
+
+    def crc_byte(value, byte):
+        return zlib.crc32(bytes([byte]), value ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+    def update(byte):
+        keys[0] = crc_byte(keys[0], byte)
+        keys[1] = ((keys[1] + (keys[0] & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        keys[2] = crc_byte(keys[2], keys[1] >> 24)
+
+    for byte in password:
+        update(byte)
+
+    out = bytearray()
+    # 加密头最后一个字节是 CRC 的最高字节，用于校验密码
+    for byte in bytes(11) + bytes([crc >> 24]) + data:
+        temp = (keys[2] | 2) & 0xFFFF
+        out.append(byte ^ (((temp * (temp ^ 1)) >> 8) & 0xFF))
+        update(byte)
+    return bytes(out)
+
+
+def _write_encrypted_zip(path, name: str, data: bytes, password: bytes) -> None:
+    """写入只包含一个加密（STORED）成员的 ZIP 文件"""
+    crc = zlib.crc32(data)
+    payload = _zip_crypto_encrypt(data, password, crc)
+    filename = name.encode("ascii")
+    fields = (0x1, zipfile.ZIP_STORED, 0, 33, crc, len(payload), len(data), len(filename), 0)
+    local = struct.pack("<4s2B4HL2L2H", b"PK\x03\x04", 20, 0, *fields) + filename
+    central = (
+        struct.pack("<4s4B4HL2L5H2L", b"PK\x01\x02", 20, 0, 20, 0, *fields, 0, 0, 0, 0, 0)
+        + filename
+    )
+    end = struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, 1, 1, len(central), len(local + payload), 0)
+    path.write_bytes(local + payload + central + end)
+
+
+def _read_tree(root):
+    """读取目录下所有文件：相对路径 -> 内容"""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+@pytest.fixture
+def members():
+    """测试用的成员内容（覆盖小文件、大文件和空文件）"""
+    return {
+        "EAIP/Terminal/ZBAA/small.pdf": b"%PDF-1.4 small chart" * 10,
+        "EAIP/Terminal/ZBAA/large.pdf": os.urandom(256 * 1024) + b"\0" * (2 * 1024 * 1024),
+        "EAIP/Terminal/ZSSS/empty.pdf": b"",
+    }
+
+
+@pytest.fixture(params=[zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED], ids=["stored", "deflated"])
+def archive(request, tmp_path, members):
+    """按给定压缩方式写入的测试 ZIP"""
+    path = tmp_path / "charts.zip"
+    with zipfile.ZipFile(path, "w", compression=request.param) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+class TestExtract:
+    """测试解压行为"""
+
+    def test_round_trip(self, archive, tmp_path, members):
+        """解压结果与原始内容一致，完成后不留下 .partial 目录"""
+        out = tmp_path / "out"
+        progress = []
+
+        assert ZipExtractor().extract(
+            str(archive), str(out), progress_callback=lambda c, t: progress.append((c, t))
+        )
+
+        assert _read_tree(out) == members
+        assert not (tmp_path / "out.partial").exists()
+        assert progress[-1] == (len(members), len(members))
+
+    def test_round_trip_without_libdeflate(self, archive, tmp_path, members, monkeypatch):
+        """未安装 libdeflate 时使用 zlib 解压"""
+        monkeypatch.setattr(zip_extractor, "deflate", None)
+        out = tmp_path / "out"
+        ZipExtractor().extract(str(archive), str(out))
+        assert _read_tree(out) == members
+
+    def test_copy_file_range_fallback(self, archive, tmp_path, members, monkeypatch):
+        """copy_file_range 不可用（如跨文件系统）时回退到普通解压"""
+
+        def cross_device(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "copy_file_range", cross_device, raising=False)
+        out = tmp_path / "out"
+        ZipExtractor().extract(str(archive), str(out))
+        assert _read_tree(out) == members
+
+    def test_central_directory_parsed_once(self, archive, tmp_path, members, monkeypatch):
+        """工作线程按偏移直接读取成员，不为每个线程重新解析中央目录"""
+        parsed = []
+        zip_file = zipfile.ZipFile
+
+        def record(*args, **kwargs):
+            parsed.append(args[0])
+            return zip_file(*args, **kwargs)
+
+        monkeypatch.setattr(zip_extractor.zipfile, "ZipFile", record)
+        extractor = ZipExtractor(max_workers=4)
+        extractor.extract(str(archive), str(tmp_path / "out"))
+        extractor.extract(str(archive), str(tmp_path / "again"))
+
+        assert len(parsed) == 1
+        assert _read_tree(tmp_path / "again") == members
+
+    def test_without_pread(self, archive, tmp_path, members, monkeypatch):
+        """没有 os.pread 的平台（Windows）上用各线程独立的描述符 seek 后读取"""
+        monkeypatch.delattr(os, "pread", raising=False)
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+        out = tmp_path / "out"
+        ZipExtractor(max_workers=4).extract(str(archive), str(out))
+        assert _read_tree(out) == members
+
+    def test_streaming_fallback(self, archive, tmp_path, members):
+        """超过整块解压上限的成员通过共用的 ZipFile 流式解压"""
+        extractor = ZipExtractor(max_workers=4)
+        extractor._in_memory_limit = 0
+        out = tmp_path / "out"
+        extractor.extract(str(archive), str(out))
+        assert _read_tree(out) == members
+
+    def test_extract_to_bytes(self, archive, members):
+        """extract_to_bytes 返回不可变的 bytes"""
+        extractor = ZipExtractor()
+        for name, data in members.items():
+            result = extractor.extract_to_bytes(str(archive), name)
+            assert type(result) is bytes
+            assert result == data
+
+        with pytest.raises(KeyError):
+            extractor.extract_to_bytes(str(archive), "missing.pdf")
+
+    def test_crc_mismatch(self, archive, tmp_path, members):
+        """CRC 不符时抛出 BadZipFile，并清理不完整的解压目录"""
+        data = archive.read_bytes()
+        crc = struct.pack("<L", zlib.crc32(members["EAIP/Terminal/ZBAA/large.pdf"]))
+        archive.write_bytes(data.replace(crc, bytes(byte ^ 0xFF for byte in crc)))
+
+        out = tmp_path / "out"
+        with pytest.raises(zipfile.BadZipFile):
+            ZipExtractor().extract(str(archive), str(out))
+        assert not out.exists()
+        assert not (tmp_path / "out.partial").exists()
+
+    def test_incremental_skip(self, archive, tmp_path, members, monkeypatch):
+        """再次解压到同一目录时只重写内容发生变化的文件"""
+        out = tmp_path / "out"
+        extractor = ZipExtractor()
+        extractor.extract(str(archive), str(out))
+
+        changed = out / "EAIP/Terminal/ZBAA/small.pdf"
+        changed.write_bytes(b"X" * changed.stat().st_size)
+
+        opened = []
+        open_target = ZipExtractor._open_target
+
+        def record(self, target, size):
+            opened.append(target)
+            return open_target(self, target, size)
+
+        monkeypatch.setattr(ZipExtractor, "_open_target", record)
+        extractor.extract(str(archive), str(out))
+
+        assert opened == [str(changed)]
+        assert _read_tree(out) == members
+
+    def test_stale_partial_discarded(self, archive, tmp_path, members):
+        """上次中断留下的 .partial 目录不会混入本次解压结果"""
+        stale = tmp_path / "out.partial" / "EAIP2505" / "Terminal" / "ZBAA"
+        stale.mkdir(parents=True)
+        (stale / "old.pdf").write_bytes(b"old")
+
+        out = tmp_path / "out"
+        ZipExtractor().extract(str(archive), str(out))
+
+        assert _read_tree(out) == members
+        assert not (tmp_path / "out.partial").exists()
+
+    def test_info_cache_single_slot(self, archive, tmp_path, monkeypatch):
+        """中央目录只缓存最近一个压缩包，文件未变化时不再重新解析"""
+        other = tmp_path / "other.zip"
+        with zipfile.ZipFile(other, "w") as zf:
+            zf.writestr("other.pdf", b"other")
+
+        parsed = []
+        zip_file = zipfile.ZipFile
+
+        def record(path, *args, **kwargs):
+            parsed.append(os.path.basename(path))
+            return zip_file(path, *args, **kwargs)
+
+        monkeypatch.setattr(zip_extractor.zipfile, "ZipFile", record)
+        extractor = ZipExtractor()
+        for path in [archive, archive, other]:
+            extractor.list_contents(str(path))
+
+        assert parsed == ["charts.zip", "other.zip"]
+        assert extractor._cache[0] == str(other)
+
+    @pytest.mark.parametrize("workers", [1, 4, 64, 4096])
+    def test_in_memory_limit(self, workers, monkeypatch):
+        """各线程同时整块解压时，占用的内存合计不超过 IN_MEMORY_MAX_SIZE"""
+        monkeypatch.setattr(zip_extractor, "deflate", object())
+        limit = ZipExtractor(max_workers=workers)._in_memory_limit
+        assert limit >= ZipExtractor.SMALL_BUFFER_SIZE
+        assert limit * workers <= max(
+            ZipExtractor.IN_MEMORY_MAX_SIZE, ZipExtractor.SMALL_BUFFER_SIZE * workers
+        )
+
+    def test_path_traversal(self, tmp_path):
+        """成员名中的 ".." 和绝对路径不能写到解压目录之外"""
+        archive = tmp_path / "evil.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("../../evil.txt", b"evil")
+            zf.writestr("/abs.txt", b"abs")
+
+        out = tmp_path / "nested" / "out"
+        ZipExtractor().extract(str(archive), str(out))
+
+        assert _read_tree(out) == {"evil.txt": b"evil", "abs.txt": b"abs"}
+        assert sorted(p.name for p in tmp_path.rglob("*.txt")) == ["abs.txt", "evil.txt"]
+
+
+class TestEncrypted:
+    """测试加密成员"""
+
+    DATA = b"%PDF-1.4 encrypted chart" * 100
+
+    @pytest.fixture
+    def encrypted(self, tmp_path):
+        path = tmp_path / "encrypted.zip"
+        _write_encrypted_zip(path, "secret.pdf", self.DATA, b"secret")
+        # 用标准库确认测试数据本身正确
+        with zipfile.ZipFile(path) as zf:
+            assert zf.read("secret.pdf", pwd=b"secret") == self.DATA
+        return path
+
+    def test_extract_with_password(self, encrypted, tmp_path):
+        """提供密码时正常解压"""
+        out = tmp_path / "out"
+        ZipExtractor().extract(str(encrypted), str(out), password="secret")
+        assert (out / "secret.pdf").read_bytes() == self.DATA
+
+    def test_extract_to_bytes_with_password(self, encrypted):
+        """extract_to_bytes 同样支持密码"""
+        assert ZipExtractor().extract_to_bytes(str(encrypted), "secret.pdf", "secret") == self.DATA
+
+    def test_missing_password(self, encrypted, tmp_path):
+        """缺少密码时解压失败，并清理解压目录"""
+        out = tmp_path / "out"
+        with pytest.raises(Exception):
+            ZipExtractor().extract(str(encrypted), str(out))
+        assert not out.exists()
+        assert not (tmp_path / "out.partial").exists()